@@ -0,0 +1,182 @@
+"""Shared helpers of the benchmark suites."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from aiohttp import ClientSession
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKE_SERVER = ROOT / "tools" / "fake_exosite.py"
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench"
+
+
+def fleet(devices: int) -> dict[str, int]:
+    """Split a device count into climates, fans and purifiers."""
+    fans = devices // 5
+    purifiers = devices // 5
+    return {"climates": devices - fans - purifiers, "fans": fans, "purifiers": purifiers}
+
+
+class FakeCloud:
+    """Define a fake Exosite server running in its own process.
+
+    A separate process keeps the server's own work out of the event loop
+    measurements of the client under test.
+    """
+
+    def __init__(self, process: subprocess.Popen, api_base: str, wss_base: str) -> None:
+        """Initialize."""
+        self.process = process
+        self.api_base = api_base
+        self.wss_base = wss_base
+        self._root = api_base.rsplit("/api:1", 1)[0]
+
+    async def stats(self) -> dict[str, Any]:
+        """Return the server traffic counters."""
+        async with ClientSession() as session:
+            async with session.get(f"{self._root}/_fake/stats") as resp:
+                return await resp.json()
+
+    async def reset(self) -> None:
+        """Zero the server traffic counters."""
+        async with ClientSession() as session:
+            async with session.post(f"{self._root}/_fake/reset") as resp:
+                await resp.read()
+
+
+@asynccontextmanager
+async def fake_cloud(devices: int, **options: Any) -> AsyncIterator[FakeCloud]:
+    """Run the fake server for a fleet of a given size."""
+    args = [sys.executable, str(FAKE_SERVER), "--port", "0"]
+    for key, value in {**fleet(devices), **options}.items():
+        args += [f"--{key.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, text=True)
+    try:
+        bases = {}
+        loop = asyncio.get_running_loop()
+        while len(bases) < 2:
+            line = await loop.run_in_executor(None, process.stdout.readline)
+            if not line:
+                msg = "fake server exited early"
+                raise RuntimeError(msg)
+            key, _, value = line.strip().removeprefix("export ").partition("=")
+            bases[key] = value
+        yield FakeCloud(process, bases["EXOHOME_API_BASE"], bases["EXOHOME_WSS_BASE"])
+    finally:
+        process.terminate()
+        process.wait()
+
+
+class LoopMonitor:
+    """Define a probe that measures how long the event loop is blocked.
+
+    A task asks to wake up every ``interval`` seconds; any lateness beyond
+    that is time the loop spent on something else without yielding.
+    """
+
+    def __init__(self, interval: float = 0.001, threshold: float = 0.002) -> None:
+        """Initialize."""
+        self._interval = interval
+        self._threshold = threshold
+        self._task: asyncio.Task | None = None
+        self.blocked = 0.0
+        self.max_block = 0.0
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            late = time.perf_counter() - start - self._interval
+            if late > self._threshold:
+                self.blocked += late
+                self.max_block = max(self.max_block, late)
+
+    def __enter__(self) -> LoopMonitor:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """Return min, median, max and percentiles of samples, in seconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "n": len(ordered),
+        "min": round(ordered[0], 6),
+        "median": round(statistics.median(ordered), 6),
+        "p95": round(pct(95), 6),
+        "p99": round(pct(99), 6),
+        "max": round(ordered[-1], 6),
+    }
+
+
+def emit(benchmark: str, results: list[dict[str, Any]], output: str | None) -> None:
+    """Write benchmark results as JSON to a file or stdout."""
+    report = {
+        "benchmark": benchmark,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+async def async_make_hass(config_dir: str):
+    """Return a bare Home Assistant instance for driving coordinators."""
+    from homeassistant.core import HomeAssistant
+
+    hass = HomeAssistant(config_dir)
+    hass.config.config_dir = config_dir
+    return hass
+
+
+def make_entry(options: dict[str, Any] | None = None):
+    """Return a config entry of the integration."""
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+    from custom_components.sampo_exohome.const import DOMAIN
+
+    kwargs: dict[str, Any] = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": EMAIL,
+        "data": {CONF_USERNAME: EMAIL, CONF_PASSWORD: PASSWORD},
+        "source": "user",
+        "options": options or {},
+        "unique_id": EMAIL,
+    }
+    parameters = inspect.signature(ConfigEntry).parameters
+    if "discovery_keys" in parameters:
+        kwargs["discovery_keys"] = {}
+    if "subentries_data" in parameters:
+        kwargs["subentries_data"] = None
+    return ConfigEntry(**kwargs)
@@ -0,0 +1,227 @@
+"""Benchmark the command path against the fake Exosite server.
+
+Scenarios:
+
+- ``entity_set``: ``ExohomeEntity.async_set_device`` with one H-code.
+- ``climate_hvac_mode``: ``ExohomeClimate.async_set_hvac_mode`` alternating
+  between off and a mode, so every other call writes power and mode.
+- ``climate_swing_mode``: ``ExohomeClimate.async_set_swing_mode`` turning
+  off both swing directions and levels, four H-codes at once.
+- ``burst``: concurrent single-field commands to many devices.
+- ``set_many``: the same burst through ``Client.set_devices``.
+
+For each, p50/p95/p99 latency from the call to the ``set`` acknowledgement
+and to the confirmed state is reported as JSON. The rate limiter is
+disabled unless ``--rate-limited`` is given, so the numbers show the
+command path itself.
+
+    python -m benchmarks.commands --rtt 0.005 0.02 --iterations 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Any
+
+from ._common import (
+    EMAIL,
+    PASSWORD,
+    FakeCloud,
+    async_make_hass,
+    emit,
+    fake_cloud,
+    make_entry,
+    summarize,
+)
+
+SWING_FIELDS = {"H0E": 1, "H0F": 1, "H10": 1, "H11": 1}
+
+
+class AckRecorder:
+    """Define a wrapper that records when each ``set`` is acknowledged."""
+
+    def __init__(self, client) -> None:
+        """Initialize."""
+        self._set_device_data = client.set_device_data
+        client.set_device_data = self._async_set_device_data
+        self.acks: dict[str, float] = {}
+
+    async def _async_set_device_data(self, device: str, data: dict) -> None:
+        await self._set_device_data(device, data)
+        self.acks[device] = time.perf_counter()
+
+
+async def _async_timed(
+    recorder: AckRecorder, device: str, call
+) -> tuple[float, float]:
+    """Return the ack and confirmation latency of one command."""
+    recorder.acks.pop(device, None)
+    start = time.perf_counter()
+    await call()
+    confirmed = time.perf_counter() - start
+    ack = recorder.acks.get(device)
+    return (ack - start if ack else confirmed), confirmed
+
+
+def _report(
+    scenario: str, acks: list[float], confirms: list[float]
+) -> dict[str, Any]:
+    return {
+        "scenario": scenario,
+        "ack_s": summarize(acks),
+        "confirmed_s": summarize(confirms),
+    }
+
+
+async def async_bench(
+    cloud: FakeCloud, args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    """Run every scenario against one fake server."""
+    from custom_components.sampo_exohome import coordinator as coordinator_module
+    from custom_components.sampo_exohome.climate import ExohomeClimate
+    from custom_components.sampo_exohome.core.client import (
+        async_get_client_with_credentials,
+    )
+    from custom_components.sampo_exohome.core.ratelimit import RateLimiter
+
+    coordinator_module.STARTUP_STAGGER_MAX = 0
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_make_hass(config_dir)
+        client = await async_get_client_with_credentials(
+            EMAIL, PASSWORD, api_base=cloud.api_base, wss_base=cloud.wss_base
+        )
+        if not args.rate_limited:
+            client.rate_limiter = RateLimiter(account_rate=0, device_rate=0)
+        coordinator = coordinator_module.ExohomeDataUpdateCoordinator(
+            hass, entry=make_entry(), client=client
+        )
+        await coordinator._async_setup()
+        await coordinator.async_refresh()
+        recorder = AckRecorder(client)
+        climates = [
+            device
+            for device, info in coordinator.data.items()
+            if info["properties"]["profile"]["esh"]["device_id"] == "1"
+        ]
+        entities = [
+            ExohomeClimate(coordinator, device, coordinator.data[device])
+            for device in climates
+        ]
+
+        try:
+            acks, confirms = [], []
+            for i in range(args.iterations):
+                entity = entities[i % len(entities)]
+                value = 1 + i % 3
+                ack, confirmed = await _async_timed(
+                    recorder,
+                    entity.device,
+                    lambda: entity.async_set_device({"H02": value}),
+                )
+                acks.append(ack)
+                confirms.append(confirmed)
+            results.append(_report("entity_set", acks, confirms))
+
+            acks, confirms = [], []
+            for i in range(args.iterations):
+                entity = entities[0]
+                mode = "off" if i % 2 else ("heat", "cool")[i // 2 % 2]
+                ack, confirmed = await _async_timed(
+                    recorder,
+                    entity.device,
+                    lambda: entity.async_set_hvac_mode(mode),
+                )
+                acks.append(ack)
+                confirms.append(confirmed)
+            results.append(_report("climate_hvac_mode", acks, confirms))
+
+            acks, confirms = [], []
+            for i in range(args.iterations):
+                entity = entities[i % len(entities)]
+                # Swing off only writes the fields that are on; turn them on
+                # first, outside the measurement.
+                await client.set_and_confirm(entity.device, SWING_FIELDS)
+                ack, confirmed = await _async_timed(
+                    recorder,
+                    entity.device,
+                    lambda: entity.async_set_swing_mode("off"),
+                )
+                acks.append(ack)
+                confirms.append(confirmed)
+            results.append(_report("climate_swing_mode", acks, confirms))
+
+            for size in args.burst:
+                targets = list(coordinator.data)[:size]
+                acks, confirms = [], []
+                for i in range(max(args.iterations // 5, 1)):
+                    value = 20 + i % 5
+                    pairs = await asyncio.gather(
+                        *(
+                            _async_timed(
+                                recorder,
+                                device,
+                                lambda device=device: coordinator.async_reconcile(
+                                    device, {"H03": value}
+                                ),
+                            )
+                            for device in targets
+                        )
+                    )
+                    acks.extend(ack for ack, _ in pairs)
+                    confirms.extend(confirmed for _, confirmed in pairs)
+                results.append(
+                    {**_report("burst", acks, confirms), "devices": len(targets)}
+                )
+
+                acks = []
+                for i in range(max(args.iterations // 5, 1)):
+                    value = 25 + i % 5
+                    start = time.perf_counter()
+                    await client.set_devices(
+                        [(device, {"H03": value}) for device in targets]
+                    )
+                    acks.extend([time.perf_counter() - start] * len(targets))
+                results.append(
+                    {**_report("set_many", acks, []), "devices": len(targets)}
+                )
+        finally:
+            await client.ws_close()
+    return results
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the suite."""
+    results = []
+    for rtt in args.rtt:
+        async with fake_cloud(
+            args.devices, latency=rtt, apply_delay=args.apply_delay
+        ) as cloud:
+            for result in await async_bench(cloud, args):
+                results.append({"rtt_s": rtt, **result})
+    emit("commands", results, args.output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50, help="fleet size")
+    parser.add_argument(
+        "--rtt", type=float, nargs="+", default=[0.005, 0.02],
+        help="simulated round trip times in seconds",
+    )
+    parser.add_argument(
+        "--apply-delay", type=float, default=0.2,
+        help="seconds a device takes to apply a write",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--burst", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--rate-limited", action="store_true")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
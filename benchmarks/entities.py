@@ -0,0 +1,201 @@
+"""Benchmark the state attribute generation of the integration's entities.
+
+Home Assistant evaluates every entity property on each state write. This
+builds the entities of all platforms the way ``async_setup_entry`` does,
+from synthetic fleet payloads or from a recorded roster, then times
+``Entity._async_calculate_state`` per entity and the hot properties on
+their own, in microseconds. Entities that are disabled by default are left
+out, as they never write state. No server or websocket is involved.
+
+    python -m benchmarks.entities --entities 1000
+    python -m benchmarks.entities --payload roster.json
+
+A recorded roster is a JSON object mapping device ids to their
+``coordinator.data`` entries, or a list of ``lst_device`` entries with a
+``status`` key, as served by the fake server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+import json
+from pathlib import Path
+import tempfile
+import time
+from typing import Any
+
+from ._common import async_make_hass, emit, fleet, make_entry, summarize
+
+PLATFORMS = ("climate", "fan", "select", "sensor", "switch")
+
+HOT_PROPERTIES = {
+    "ExohomeClimate": (
+        "supported_features",
+        "hvac_mode",
+        "hvac_modes",
+        "fan_mode",
+        "fan_modes",
+        "swing_mode",
+        "swing_modes",
+        "preset_mode",
+        "preset_modes",
+    ),
+    "ExohomeFan": ("supported_features", "percentage", "preset_mode", "preset_modes"),
+    "ExohomeSelect": ("options", "current_option"),
+}
+
+
+def synthetic_roster(devices: int) -> dict[str, dict[str, Any]]:
+    """Return ``coordinator.data`` for a synthetic fleet."""
+    from tools.fake_exosite import (
+        DEVICE_TYPE_AIRPURIFIER,
+        DEVICE_TYPE_CLIMATE,
+        DEVICE_TYPE_FAN,
+        make_device,
+    )
+
+    counts = fleet(devices)
+    entries = [
+        make_device(index, device_type)
+        for device_type, count in (
+            (DEVICE_TYPE_CLIMATE, counts["climates"]),
+            (DEVICE_TYPE_FAN, counts["fans"]),
+            (DEVICE_TYPE_AIRPURIFIER, counts["purifiers"]),
+        )
+        for index in range(count)
+    ]
+    return load_roster(entries)
+
+
+def load_roster(payload: Any) -> dict[str, dict[str, Any]]:
+    """Return ``coordinator.data`` from a recorded roster."""
+    if isinstance(payload, dict):
+        return payload
+    roster = {}
+    for entry in payload:
+        properties = dict(entry["properties"])
+        properties["status"] = entry.get("status") or properties.get("status", {})
+        roster[entry["device"]] = {**entry, "properties": properties}
+    return roster
+
+
+async def async_build_entities(
+    roster: dict[str, dict[str, Any]], config_dir: str
+) -> list:
+    """Return the enabled entities all platforms would add for a roster."""
+    from importlib import import_module
+
+    from homeassistant.config_entries import current_entry
+
+    from custom_components.sampo_exohome.const import DOMAIN
+    from custom_components.sampo_exohome.core.client import Client
+    from custom_components.sampo_exohome.coordinator import (
+        ExohomeDataUpdateCoordinator,
+    )
+
+    hass = await async_make_hass(config_dir)
+    entry = make_entry()
+    current_entry.set(entry)
+    client = Client()
+    client.devices = roster
+    coordinator = ExohomeDataUpdateCoordinator(hass, entry=entry, client=client)
+    coordinator.data = roster
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    entities: list = []
+    for platform in PLATFORMS:
+        module = import_module(f"custom_components.sampo_exohome.{platform}")
+        await module.async_setup_entry(hass, entry, entities.extend)
+    # Disabled entities never write state.
+    entities = [
+        entity for entity in entities if entity.entity_registry_enabled_default
+    ]
+    for index, entity in enumerate(entities):
+        entity.hass = hass
+        domain = type(entity).__module__.rsplit(".", 1)[-1]
+        entity.entity_id = f"{domain}.bench_{index}"
+    return entities
+
+
+def _time(func, repeat: int) -> float:
+    """Return the best time of ``repeat`` calls, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / 1000
+
+
+def bench(entities: list, repeat: int) -> list[dict[str, Any]]:
+    """Time state generation per entity class and the hot properties."""
+    by_class: dict[str, list] = defaultdict(list)
+    for entity in entities:
+        by_class[type(entity).__name__].append(entity)
+
+    results = []
+    total = 0.0
+    for name, group in sorted(by_class.items()):
+        per_entity = [
+            _time(entity._async_calculate_state, repeat) for entity in group
+        ]
+        total += sum(per_entity)
+        properties = {}
+        for prop in HOT_PROPERTIES.get(name, ()):
+            samples = [
+                _time(lambda entity=entity: getattr(entity, prop), repeat)
+                for entity in group
+            ]
+            properties[prop] = summarize(samples)
+        results.append(
+            {
+                "entity_class": name,
+                "entities": len(group),
+                "calculate_state_us": summarize(per_entity),
+                "properties_us": properties,
+            }
+        )
+    results.append(
+        {
+            "entity_class": "all",
+            "entities": len(entities),
+            "calculate_state_total_ms": round(total / 1000, 3),
+        }
+    )
+    return results
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the suite."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        if args.payload:
+            roster = load_roster(json.loads(Path(args.payload).read_text()))
+            entities = await async_build_entities(roster, config_dir)
+        else:
+            # Grow the fleet until it yields enough entities.
+            devices = max(args.entities // 20, 1)
+            while True:
+                entities = await async_build_entities(
+                    synthetic_roster(devices), config_dir
+                )
+                if len(entities) >= args.entities:
+                    break
+                devices *= 2
+            entities = entities[: args.entities]
+        results = bench(entities, args.repeat)
+    emit("entities", results, args.output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--payload", help="recorded roster JSON to build from")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
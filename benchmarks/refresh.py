@@ -0,0 +1,139 @@
+"""Benchmark a full fleet refresh against the fake Exosite server.
+
+For every fleet size and simulated round trip time this times
+``Client.get_all_devices`` and ``ExohomeDataUpdateCoordinator.async_refresh``
+and reports wall time, frames and bytes on the wire, peak memory and the
+time the event loop was blocked, as JSON.
+
+    python -m benchmarks.refresh --devices 1 10 100 --rtt 0 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from ._common import (
+    EMAIL,
+    PASSWORD,
+    FakeCloud,
+    LoopMonitor,
+    async_make_hass,
+    emit,
+    fake_cloud,
+    make_entry,
+    summarize,
+)
+
+
+async def _async_measure(
+    cloud: FakeCloud, refresh, repeat: int
+) -> dict[str, Any]:
+    """Time repeated refreshes, then measure peak memory of one more."""
+    await refresh()  # warm-up: opens the socket and fills the cache
+    await cloud.reset()
+    walls = []
+    blocked = []
+    max_block = 0.0
+    for _ in range(repeat):
+        with LoopMonitor() as monitor:
+            start = time.perf_counter()
+            await refresh()
+            walls.append(time.perf_counter() - start)
+        blocked.append(monitor.blocked)
+        max_block = max(max_block, monitor.max_block)
+    stats = await cloud.stats()
+
+    tracemalloc.start()
+    await refresh()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_s": summarize(walls),
+        "frames_sent": stats["frames_in"] / repeat,
+        "frames_received": stats["frames_out"] / repeat,
+        "bytes": (stats["bytes_in"] + stats["bytes_out"]) / repeat,
+        "peak_memory_bytes": peak,
+        "loop_blocked_s": summarize(blocked),
+        "loop_max_block_s": round(max_block, 6),
+    }
+
+
+async def async_bench_client(cloud: FakeCloud, repeat: int) -> dict[str, Any]:
+    """Benchmark Client.get_all_devices."""
+    from custom_components.sampo_exohome.core.client import (
+        async_get_client_with_credentials,
+    )
+
+    client = await async_get_client_with_credentials(
+        EMAIL, PASSWORD, api_base=cloud.api_base, wss_base=cloud.wss_base
+    )
+    await client.ws_connect(None)
+    try:
+        return await _async_measure(cloud, client.get_all_devices, repeat)
+    finally:
+        await client.ws_close()
+
+
+async def async_bench_coordinator(cloud: FakeCloud, repeat: int) -> dict[str, Any]:
+    """Benchmark a refresh of the account coordinator."""
+    from custom_components.sampo_exohome import coordinator as coordinator_module
+    from custom_components.sampo_exohome.core.client import (
+        async_get_client_with_credentials,
+    )
+
+    # Skip the startup stagger; nothing else is starting here.
+    coordinator_module.STARTUP_STAGGER_MAX = 0
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_make_hass(config_dir)
+        client = await async_get_client_with_credentials(
+            EMAIL, PASSWORD, api_base=cloud.api_base, wss_base=cloud.wss_base
+        )
+        coordinator = coordinator_module.ExohomeDataUpdateCoordinator(
+            hass, entry=make_entry(), client=client
+        )
+        await coordinator._async_setup()
+        try:
+            return await _async_measure(cloud, coordinator.async_refresh, repeat)
+        finally:
+            await client.ws_close()
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the suite."""
+    results = []
+    for devices in args.devices:
+        for rtt in args.rtt:
+            async with fake_cloud(devices, latency=rtt) as cloud:
+                for target, bench in (
+                    ("client", async_bench_client),
+                    ("coordinator", async_bench_coordinator),
+                ):
+                    result = await bench(cloud, args.repeat)
+                    results.append(
+                        {"target": target, "devices": devices, "rtt_s": rtt, **result}
+                    )
+    emit("refresh", results, args.output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--devices", type=int, nargs="+", default=[1, 10, 100, 1000]
+    )
+    parser.add_argument(
+        "--rtt", type=float, nargs="+", default=[0.0, 0.005, 0.02],
+        help="simulated round trip times in seconds",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Replay a recorded websocket session through the account coordinator.
+
+Recordings are written by the "record websocket frames" option into
+``<config>/sampo_exohome/frames-<entry_id>.jsonl``. This feeds one back to
+a client and coordinator and reports the duration of each refresh and the
+time the event loop was blocked, as JSON.
+
+    python -m benchmarks.replay frames.jsonl --speed 10 --refreshes 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Any
+
+from ._common import LoopMonitor, async_make_hass, emit, make_entry, summarize
+
+
+async def async_bench(args: argparse.Namespace) -> dict[str, Any]:
+    """Run refreshes against a replay of the recording."""
+    from custom_components.sampo_exohome import coordinator as coordinator_module
+    from custom_components.sampo_exohome.core.client import Client
+    from custom_components.sampo_exohome.core.recorder import Replay
+
+    coordinator_module.STARTUP_STAGGER_MAX = 0
+    replay = Replay.from_file(args.recording, speed=args.speed)
+    client = Client()
+    # Recorded tokens are redacted; any unexpired token will do.
+    await client.async_set_token("", "", "replay", int(time.time()) + 3600)
+    client.connect_transport = replay.connect
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_make_hass(config_dir)
+        coordinator = coordinator_module.ExohomeDataUpdateCoordinator(
+            hass, entry=make_entry(), client=client
+        )
+        await coordinator._async_setup()
+        walls = []
+        with LoopMonitor() as monitor:
+            for _ in range(args.refreshes):
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                walls.append(time.perf_counter() - start)
+        await client.ws_close()
+        await replay.async_close()
+
+    return {
+        "recording": args.recording,
+        "speed": args.speed,
+        "devices": len(coordinator.data or {}),
+        "refresh_s": summarize(walls),
+        "loop_blocked_s": round(monitor.blocked, 6),
+        "loop_max_block_s": round(monitor.max_block, 6),
+        "unanswered_requests": replay.unanswered,
+        "decode": dict(client.decode_stats),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="frames file written by the recorder")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--refreshes", type=int, default=3)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+    emit("replay", [asyncio.run(async_bench(args))], args.output)
+
+
+if __name__ == "__main__":
+    main()
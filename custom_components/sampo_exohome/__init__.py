@@ -9,12 +9,24 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.typing import ConfigType
 
 from .core.errors import InvalidCredentialsError, ExohomeError
+from .core.ratelimit import DEFAULT_ACCOUNT_RATE, DEFAULT_DEVICE_RATE, RateLimiter
 from .coordinator import ExohomeDataUpdateCoordinator
+from .services import async_setup_services
 from .util import async_get_client_with_credentials
 from .const import (
+    CONF_ACCOUNT_RATE_LIMIT,
+    CONF_DEVICE_RATE_LIMIT,
+    CONF_EXPORT_TRACES,
+    CONF_FIELD_FILTER,
+    CONF_IDLE_POLL_INTERVAL,
+    CONF_IDLE_TIMEOUT,
+    CONF_PER_DEVICE_COORDINATORS,
+    CONF_RECORD_FRAMES,
     DOMAIN
 )
 
@@ -22,6 +34,14 @@ PLATFORMS = [Platform.CLIMATE, Platform.FAN, Platform.SENSOR, Platform.SELECT, P
 
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=1)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Sampo Smart Home services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Sampo Smart Home as a config entry."""
@@ -41,22 +61,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.config_entries.async_update_entry(entry, **entry_updates)
 
-    coordinator = ExohomeDataUpdateCoordinator(hass, entry=entry, client=client)
+    client.rate_limiter = RateLimiter(
+        account_rate=entry.options.get(CONF_ACCOUNT_RATE_LIMIT, DEFAULT_ACCOUNT_RATE),
+        device_rate=entry.options.get(CONF_DEVICE_RATE_LIMIT, DEFAULT_DEVICE_RATE),
+    )
+    client.field_filter = entry.options.get(CONF_FIELD_FILTER, False)
+    client.idle_timeout = entry.options.get(CONF_IDLE_TIMEOUT, 0) * 60
+    idle_poll_minutes = entry.options.get(CONF_IDLE_POLL_INTERVAL, 0)
+    if entry.options.get(CONF_RECORD_FRAMES, False):
+        client.start_recording(
+            hass.config.path(DOMAIN, f"frames-{entry.entry_id}.jsonl")
+        )
+    if entry.options.get(CONF_EXPORT_TRACES, False):
+        client.tracer.export_to(
+            hass.config.path(DOMAIN, f"traces-{entry.entry_id}.jsonl")
+        )
+
+    coordinator = ExohomeDataUpdateCoordinator(
+        hass,
+        entry=entry,
+        client=client,
+        per_device=entry.options.get(CONF_PER_DEVICE_COORDINATORS, False),
+        idle_poll_interval=timedelta(minutes=idle_poll_minutes)
+        if idle_poll_minutes
+        else None,
+    )
     await coordinator.async_config_entry_first_refresh()
+    if coordinator.per_device:
+        await coordinator.async_setup_device_coordinators()
     #await coordinator.async_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.async_start_field_tracking()
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a Sampo Smart Home config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.owners.async_remove(coordinator)
+        await coordinator.async_shutdown()
+        await coordinator.get_client().async_stop_recording()
+        await coordinator.get_client().tracer.async_close()
 
     return unload_ok
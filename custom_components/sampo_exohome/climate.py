@@ -1,7 +1,5 @@
 """Support for Exohome  Climate"""
 
-import asyncio
-
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
     HVACMode,
@@ -82,6 +80,18 @@ async def async_setup_entry(
 
 class ExohomeClimate(ExohomeEntity, ClimateEntity):
     """Define a Exohome climate."""
+    _read_fields = frozenset({
+        CLIMATE_FAN_SPEED,
+        CLIMATE_OPERATING_MODE,
+        CLIMATE_POWER,
+        CLIMATE_SWING_VERTICAL,
+        CLIMATE_SWING_VERTICAL_LEVEL,
+        CLIMATE_SWING_HORIZONTAL,
+        CLIMATE_SWING_HORIZONTAL_LEVEL,
+        CLIMATE_TARGET_TEMPERATURE,
+        CLIMATE_TEMPERATURE_INDOOR,
+        *CLIMATE_AVAILABLE_PRESET_MODES,
+    })
     _swing_mode = SWING_OFF
     _swing_vertical_level = 0
     _swing_horizontal_level = 0
@@ -158,15 +168,13 @@ class ExohomeClimate(ExohomeEntity, ClimateEntity):
         is_on = bool(int(status.get(CLIMATE_POWER, 0)))
 
         if hvac_mode == HVACMode.OFF:
-            await self.client.set_device(self.device, CLIMATE_POWER, 0)
+            data = {CLIMATE_POWER: 0}
         else:
             mode = CLIMATE_AVAILABLE_MODES.get(hvac_mode)
-            await self.client.set_device(self.device, CLIMATE_OPERATING_MODE, mode)
+            data = {CLIMATE_OPERATING_MODE: mode}
             if not is_on:
-                await self.client.set_device(self.device, CLIMATE_POWER, 1)
-
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
+                data[CLIMATE_POWER] = 1
+        await self.async_set_device(data)
 
     @property
     def preset_mode(self) -> str:
@@ -198,16 +206,15 @@ class ExohomeClimate(ExohomeEntity, ClimateEntity):
 
     async def async_set_preset_mode(self, preset_mode) -> None:
         """Set new preset mode."""
-        info = await self.client.get_device_with_info(self.device)
-        is_on = bool(int(info["status"].get(CLIMATE_POWER, 0)))
+        status = self.coordinator.data[self.device]["properties"]["status"]
+        is_on = bool(int(status.get(CLIMATE_POWER, 0)))
 
         func = get_key_from_dict(CLIMATE_AVAILABLE_PRESET_MODES, preset_mode)
 
-        await self.client.set_device(self.device, func, 1)
+        data = {func: 1}
         if not is_on:
-            await self.client.set_device(self.device, CLIMATE_POWER, 1)
-
-        await self.coordinator.async_request_refresh()
+            data[CLIMATE_POWER] = 1
+        await self.async_set_device(data)
 
     @property
     def fan_mode(self) -> str:
@@ -241,8 +248,7 @@ class ExohomeClimate(ExohomeEntity, ClimateEntity):
         """Set new fan mode."""
 
         value = CLIMATE_AVAILABLE_FAN_MODES[fan_mode]
-        await self.client.set_device(self.device, CLIMATE_FAN_SPEED, value)
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({CLIMATE_FAN_SPEED: value})
 
     @property
     def swing_mode(self) -> str:
@@ -301,50 +307,42 @@ class ExohomeClimate(ExohomeEntity, ClimateEntity):
         swing_vertical_level = status.get(CLIMATE_SWING_VERTICAL_LEVEL, None)
         swing_horizontal_level = status.get(CLIMATE_SWING_HORIZONTAL_LEVEL, None)
 
+        data = {}
         if swing_mode == SWING_ON:
             if self._swing_mode == SWING_HORIZONTAL:
                 if swing_horizontal:
-                    await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL, 1)
+                    data[CLIMATE_SWING_HORIZONTAL] = 1
                 if swing_horizontal_level:
-                    await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL_LEVEL, self._swing_horizontal_level)
+                    data[CLIMATE_SWING_HORIZONTAL_LEVEL] = self._swing_horizontal_level
             if self._swing_mode == SWING_VERTICAL:
                 if swing_vertical:
-                    await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL, 1)
+                    data[CLIMATE_SWING_VERTICAL] = 1
                 if swing_vertical_level:
-                    await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL_LEVEL, self._swing_vertical_level)
+                    data[CLIMATE_SWING_VERTICAL_LEVEL] = self._swing_vertical_level
 
         if swing_mode == SWING_OFF:
             if swing_horizontal:
-                await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL, 0)
-            if swing_horizontal_level:
-                await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL_LEVEL, 0)
-            if swing_vertical:
-                await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL, 0)
-            if swing_vertical_level:
-                await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL_LEVEL, 0)
-
-        if swing_mode == SWING_HORIZONTAL:
-            if swing_horizontal:
-                await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL, 1)
+                data[CLIMATE_SWING_HORIZONTAL] = 0
             if swing_horizontal_level:
-                await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL_LEVEL, self._swing_horizontal_level)
-        if swing_mode == SWING_VERTICAL:
+                data[CLIMATE_SWING_HORIZONTAL_LEVEL] = 0
             if swing_vertical:
-                await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL, 1)
+                data[CLIMATE_SWING_VERTICAL] = 0
             if swing_vertical_level:
-                await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL_LEVEL, self._swing_vertical_level)
+                data[CLIMATE_SWING_VERTICAL_LEVEL] = 0
 
-        if swing_mode == SWING_BOTH:
+        if swing_mode in (SWING_HORIZONTAL, SWING_BOTH):
             if swing_horizontal:
-                await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL, 1)
+                data[CLIMATE_SWING_HORIZONTAL] = 1
             if swing_horizontal_level:
-                await self.client.set_device(self.device, CLIMATE_SWING_HORIZONTAL_LEVEL, self._swing_horizontal_level)
+                data[CLIMATE_SWING_HORIZONTAL_LEVEL] = self._swing_horizontal_level
+        if swing_mode in (SWING_VERTICAL, SWING_BOTH):
             if swing_vertical:
-                await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL, 1)
+                data[CLIMATE_SWING_VERTICAL] = 1
             if swing_vertical_level:
-                await self.client.set_device(self.device, CLIMATE_SWING_VERTICAL_LEVEL, self._swing_vertical_level)
+                data[CLIMATE_SWING_VERTICAL_LEVEL] = self._swing_vertical_level
 
-        await self.coordinator.async_request_refresh()
+        if data:
+            await self.async_set_device(data)
 
     @property
     def target_temperature(self) -> int:
@@ -356,8 +354,7 @@ class ExohomeClimate(ExohomeEntity, ClimateEntity):
     async def async_set_temperature(self, **kwargs):
         """ Set new target temperature """
         temp = kwargs.get(ATTR_TEMPERATURE)
-        await self.client.set_device(self.device, CLIMATE_TARGET_TEMPERATURE, int(temp))
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({CLIMATE_TARGET_TEMPERATURE: int(temp)})
 
     @property
     def current_temperature(self) -> int:
@@ -401,11 +398,9 @@ class ExohomeClimate(ExohomeEntity, ClimateEntity):
 
     async def async_turn_on(self) -> None:
         """Turn the entity on."""
-        await self.client.set_device(self.device, CLIMATE_POWER, 1)
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({CLIMATE_POWER: 1})
 
     async def async_turn_off(self) -> None:
         """Turn the entity off."""
-        await self.client.set_device(self.device, CLIMATE_POWER, 0)
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({CLIMATE_POWER: 0})
 
@@ -8,13 +8,31 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_TOKEN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 from .core.errors import InvalidCredentialsError, ExohomeError
+from .core.ratelimit import DEFAULT_ACCOUNT_RATE, DEFAULT_DEVICE_RATE
 from .util import async_get_client_with_credentials
-from .const import CONF_USER_ID, DOMAIN, LOGGER
+from .const import (
+    CONF_ACCOUNT_RATE_LIMIT,
+    CONF_DEVICE_RATE_LIMIT,
+    CONF_EXPORT_TRACES,
+    CONF_FIELD_FILTER,
+    CONF_IDLE_POLL_INTERVAL,
+    CONF_IDLE_TIMEOUT,
+    CONF_PER_DEVICE_COORDINATORS,
+    CONF_RECORD_FRAMES,
+    CONF_USER_ID,
+    DOMAIN,
+    LOGGER,
+)
 
 AUTH_SCHEMA = vol.Schema(
     {
@@ -68,6 +86,12 @@ class ExohomeFlowHandler(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return ExohomeOptionsFlowHandler()
+
     async def async_step_reauth(
         self, entry_data: Mapping[str, Any]
     ) -> ConfigFlowResult:
@@ -137,3 +161,59 @@ class ExohomeFlowHandler(ConfigFlow, domain=DOMAIN):
                 CONF_TOKEN: credentials_validation_result.token
             },
         )
+
+
+class ExohomeOptionsFlowHandler(OptionsFlow):
+    """Handle Sampo Smart Home options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_ACCOUNT_RATE_LIMIT,
+                        default=options.get(
+                            CONF_ACCOUNT_RATE_LIMIT, DEFAULT_ACCOUNT_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_DEVICE_RATE_LIMIT,
+                        default=options.get(
+                            CONF_DEVICE_RATE_LIMIT, DEFAULT_DEVICE_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_PER_DEVICE_COORDINATORS,
+                        default=options.get(CONF_PER_DEVICE_COORDINATORS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_FIELD_FILTER,
+                        default=options.get(CONF_FIELD_FILTER, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_IDLE_POLL_INTERVAL,
+                        default=options.get(CONF_IDLE_POLL_INTERVAL, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_RECORD_FRAMES,
+                        default=options.get(CONF_RECORD_FRAMES, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_EXPORT_TRACES,
+                        default=options.get(CONF_EXPORT_TRACES, False),
+                    ): bool,
+                }
+            ),
+        )
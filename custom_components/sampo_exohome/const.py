@@ -28,6 +28,14 @@ REFRESH_TOKEN_EXPIRY_TIME = timedelta(days=30)
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_USER_ID = "user_id"
 CONF_TOKEN_EXPIRES_AT = "token_expires_at"
+CONF_ACCOUNT_RATE_LIMIT = "account_rate_limit"
+CONF_DEVICE_RATE_LIMIT = "device_rate_limit"
+CONF_PER_DEVICE_COORDINATORS = "per_device_coordinators"
+CONF_FIELD_FILTER = "field_filter"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_IDLE_POLL_INTERVAL = "idle_poll_interval"
+CONF_RECORD_FRAMES = "record_frames"
+CONF_EXPORT_TRACES = "export_traces"
 
 SENSOR_BATTERY = "low_battery"
 SENSOR_DOOR = "door"
@@ -1,8 +1,12 @@
 """Define a Sampo Exohome data coordinator."""
 
 import asyncio
+from collections import Counter
 from collections.abc import Callable
 from datetime import timedelta
+import hashlib
+import random
+import time
 from typing import Any
 from datetime import datetime
 
@@ -14,9 +18,13 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util.ssl import get_default_context
 
+from .core.breaker import STATE_HALF_OPEN, CircuitBreaker
 from .core.client import Client
 from .core.device import Device
-from .core.errors import InvalidCredentialsError, ExohomeError
+from .core.errors import InvalidCredentialsError, ExohomeError, RequestDeferredError
+from .core.profiler import PROFILER
+from .core.reconciler import DeviceReconciler
+from .core.scheduler import DEFAULT_MAX_POLL_BACKLOG
 from .util import async_store_token as store_token
 from .const import (
     CONF_USER_ID,
@@ -26,12 +34,81 @@ from .const import (
 )
 
 DATA_SENSORS = "sensors"
+DATA_DEVICE_OWNERS = "device_owners"
 #DATA_USER_PREFERENCES = "user_preferences"
 
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=1)
+ROSTER_SCAN_INTERVAL = timedelta(minutes=5)
 
+ACCOUNT_FAILURE_THRESHOLD = 2
+ACCOUNT_BASE_BACKOFF = 60
+ACCOUNT_MAX_BACKOFF = 1800
+ACCOUNT_BACKOFF_JITTER = 0.2
 
-class ExohomeDataUpdateCoordinator(DataUpdateCoordinator):
+POLL_JITTER = 0.05
+STARTUP_STAGGER_MAX = 10
+# First refreshes of device coordinators run at once; keep them well below
+# the poll backlog, past which the scheduler drops polls.
+SETUP_REFRESH_CONCURRENCY = DEFAULT_MAX_POLL_BACKLOG // 2
+
+
+def phase_offset(seed: str) -> float:
+    """Return a stable fraction in [0, 1) derived from a seed."""
+    digest = hashlib.sha256(seed.encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32
+
+
+class ExohomeStaggeredCoordinator(DataUpdateCoordinator):
+    """Define a coordinator that refreshes at a stable phase of its interval."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        name: str,
+        update_interval: timedelta,
+        seed: str,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass,
+            LOGGER,
+            name=name,
+            update_interval=update_interval,
+        )
+        self._base_interval = update_interval
+        # Spread refreshes over the polling interval: the phase is fixed per
+        # seed, so restarts keep the spread.
+        self._phase = phase_offset(seed)
+        self._phase_applied = False
+
+    def _refresh_interval(self) -> timedelta | None:
+        """Return the polling interval currently in effect."""
+        return self._base_interval
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, profiled while a profile runs."""
+        with PROFILER.section():
+            super().async_update_listeners()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh at the stable phase, with a little jitter."""
+        base = self._refresh_interval()
+        if base is None:
+            # Polling is paused until a command wakes the coordinator up.
+            self.update_interval = None
+            return
+        if not self._phase_applied:
+            self._phase_applied = True
+            self.update_interval = base + base * self._phase
+        else:
+            self.update_interval = base * (1 + random.uniform(-POLL_JITTER, POLL_JITTER))
+        super()._schedule_refresh()
+
+
+class ExohomeDataUpdateCoordinator(ExohomeStaggeredCoordinator):
     """Define a Exohome data coordinator."""
 
     config_entry: ConfigEntry
@@ -42,34 +119,121 @@ class ExohomeDataUpdateCoordinator(DataUpdateCoordinator):
         *,
         entry: ConfigEntry,
         client: Client,
+        per_device: bool = False,
+        idle_poll_interval: timedelta | None = None,
     ) -> None:
-        """Initialize."""
+        """Initialize.
+
+        Args:
+        ----
+            hass: The Home Assistant instance.
+            entry: The config entry.
+            client: The exohome client.
+            per_device: Whether each device gets its own coordinator.
+            idle_poll_interval: The polling interval while the client is
+                idle, or None to stop polling until the next command.
+
+        """
         super().__init__(
             hass,
-            LOGGER,
             name=entry.data[CONF_USERNAME],
-            update_interval=DEFAULT_SCAN_INTERVAL,
+            update_interval=ROSTER_SCAN_INTERVAL if per_device else DEFAULT_SCAN_INTERVAL,
+            seed=f"{client.session_name}:{entry.entry_id}",
         )
         self._token_expries_at = 0
         self._client = client
         self._entry = entry
         self._hass = hass
-        hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, self._async_ha_stop),
+        self._reconcilers: dict[str, DeviceReconciler] = {}
+        self.breaker = CircuitBreaker(
+            failure_threshold=ACCOUNT_FAILURE_THRESHOLD,
+            base_backoff=ACCOUNT_BASE_BACKOFF,
+            max_backoff=ACCOUNT_MAX_BACKOFF,
+            jitter=ACCOUNT_BACKOFF_JITTER,
+        )
+        self.per_device = per_device
+        self.device_coordinators: dict[str, ExohomeDeviceCoordinator] = {}
+        # Devices listed after setup; they get entities on the next reload.
+        self._unloaded_devices: set[str] = set()
+        self._field_refs: dict[str, Counter[str]] = {}
+        self.idle_poll_interval = idle_poll_interval
+        self.owners: ExohomeDeviceOwners = hass.data.setdefault(
+            DOMAIN, {}
+        ).setdefault(DATA_DEVICE_OWNERS, ExohomeDeviceOwners())
+        entry.async_on_unload(
+            hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, self._async_ha_stop)
+        )
+        self._remove_push_listener = client.ingest.add_listener(self._async_handle_push)
+
+    @callback
+    def _async_handle_push(self, devices: set[str]) -> None:
+        """Update listeners once for a batch of pushed status."""
+        if self.data is None:
+            return
+        self.async_update_listeners()
+        for device in devices:
+            if device in self.device_coordinators:
+                self.device_coordinators[device].async_update_listeners()
+        self.owners.async_notify(self, list(devices))
+
+    async def async_shutdown(self) -> None:
+        """Stop pending writes, pushed status and the socket on unload."""
+        await super().async_shutdown()
+        self._remove_push_listener()
+        for reconciler in self._reconcilers.values():
+            await reconciler.async_shutdown()
+        await self._client.ws_close()
 
     async def _async_ha_stop(self, event: Event) -> None:
         """Stop reconnecting if hass is stopping."""
         await self._client.ws_close()
 
     async def _async_update_data(self) -> dict:
-        """Fetch data from Exohome."""
+        """Fetch data from Exohome, timed, traced and profiled on demand."""
+        start = time.monotonic()
+        with self._client.tracer.trace("refresh", per_device=self.per_device):
+            try:
+                return await PROFILER.wrap(self._async_fetch_data())
+            finally:
+                self._client.metrics.observe("refresh", time.monotonic() - start)
+                PROFILER.cycle_done()
+
+    async def _async_fetch_data(self) -> dict:
+        """Fetch data from Exohome.
+
+        While the account breaker is open no request is made. Once the
+        backoff expires a single cheap probe must succeed before the next
+        full sweep. In per-device mode only the roster is refreshed here.
+        """
+        if not self.breaker.allow():
+            raise UpdateFailed(
+                f"Exohome cloud unavailable, retrying in {self.breaker.retry_in:.0f}s"
+            )
+
         try:
-            devices = await self._client.get_all_devices()
+            if self.breaker.state == STATE_HALF_OPEN:
+                await self._client.async_probe()
+            devices = await self._client.get_all_devices(
+                fetch_status=not self.per_device)
         except InvalidCredentialsError as e:
             raise ConfigEntryAuthFailed from e
+        except RequestDeferredError as e:
+            # A busy queue says nothing about the health of the cloud.
+            raise UpdateFailed(f"Exohome update deferred: {e}") from e
         except ExohomeError as e:
+            self.breaker.record_failure()
             raise UpdateFailed(
                 f"There was a Exohome error while updating: {e}"
             ) from e
+        self.breaker.record_success()
+        self.owners.async_update(self)
+        if self.data is not None:
+            self._async_report_new_devices(devices)
+        if not self.per_device:
+            self.owners.async_notify(self, list(devices))
+        for coordinator in self.device_coordinators.values():
+            coordinator.async_update_listeners()
+        await self._client.async_close_if_idle()
         email, password, expires_at = self._client.get_login_info()
 
         if expires_at != self._token_expries_at:
@@ -85,11 +249,17 @@ class ExohomeDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_setup(self) -> None:
         """Set up the coordinator."""
+        # Stagger the first login so instances restarted together after a
+        # power event do not reach the cloud at the same moment. Entries
+        # reloaded or added once Home Assistant runs log in at once.
+        if not self.hass.is_running:
+            await asyncio.sleep(STARTUP_STAGGER_MAX * self._phase)
         async with asyncio.timeout(10):
             try:
                 _, _, self._token_expries_at = self._client.get_login_info()
                 default_context = get_default_context()
-                await self._client.ws_connect(default_context)
+                with self._client.tracer.trace("setup"):
+                    await self._client.ws_connect(default_context)
                 #devices = await self._client.get_all_devices()
             except InvalidCredentialsError as e:
                 raise ConfigEntryAuthFailed from e
@@ -100,6 +270,313 @@ class ExohomeDataUpdateCoordinator(DataUpdateCoordinator):
             #else:
             #    self.data = devices
 
+    @callback
+    def _async_report_new_devices(self, devices: dict) -> None:
+        """Log devices the roster gained since the entry was set up.
+
+        Entities, and in per-device mode coordinators, are only created at
+        setup, so a new device gets them once the entry is reloaded.
+        """
+        known = self.data or {}
+        for device in devices:
+            if device in known or device in self._unloaded_devices:
+                continue
+            self._unloaded_devices.add(device)
+            LOGGER.info(
+                "Device %s was added to the account; reload the entry to set it up",
+                device,
+            )
+
+    async def async_setup_device_coordinators(self) -> None:
+        """Create and refresh one coordinator per listed device.
+
+        Only devices listed at setup get a coordinator; see
+        ``_async_report_new_devices``.
+        """
+        for device in self.data or {}:
+            if device not in self.device_coordinators:
+                self.device_coordinators[device] = ExohomeDeviceCoordinator(
+                    self._hass, account=self, device=device)
+        semaphore = asyncio.Semaphore(SETUP_REFRESH_CONCURRENCY)
+
+        async def _async_refresh(coordinator: ExohomeDeviceCoordinator) -> None:
+            async with semaphore:
+                await coordinator.async_refresh()
+
+        await asyncio.gather(
+            *(
+                _async_refresh(coordinator)
+                for coordinator in self.device_coordinators.values()
+            )
+        )
+
+    async def async_refresh_devices(self, devices: list[str]) -> None:
+        """Request one refresh covering the given devices."""
+        if not self.per_device:
+            await self.async_request_refresh()
+            return
+        for device in set(devices):
+            await self.coordinator_for(device).async_request_refresh()
+
+    def _refresh_interval(self) -> timedelta | None:
+        """Return the idle interval while the client is idle."""
+        if self._client.idle:
+            return self.idle_poll_interval
+        return self._base_interval
+
+    @callback
+    def _async_wake(self) -> None:
+        """Resume regular polling after a command ended an idle period."""
+        for coordinator in (self, *self.device_coordinators.values()):
+            coordinator._schedule_refresh()
+
+    def coordinator_for(self, device: str) -> DataUpdateCoordinator:
+        """Return the coordinator entities of a device should follow."""
+        return self.device_coordinators.get(device, self)
+
+    async def async_reconcile(self, device: str, data: dict) -> bool:
+        """Send desired H-code values through the device reconciler.
+
+        Returns:
+        -------
+            Whether the device confirmed the new state.
+
+        """
+        reconciler = self._reconcilers.get(device)
+        if reconciler is None:
+            reconciler = DeviceReconciler(self._client, device)
+            self._reconcilers[device] = reconciler
+        was_idle = self._client.idle
+        try:
+            return await reconciler.async_set(data)
+        finally:
+            if was_idle:
+                self._async_wake()
+
+    async def async_set_device(self, device: str, data: dict) -> None:
+        """Send desired H-code values through the device reconciler.
+
+        Listeners are updated as soon as the device confirms the new state;
+        a full refresh is only requested when it does not.
+        """
+        tracer = self._client.tracer
+        with tracer.trace("command", device=device, fields=sorted(data)):
+            if await self.async_reconcile(device, data):
+                self.async_update_listeners()
+            else:
+                await self.async_request_refresh()
+
+    @callback
+    def async_track_fields(self, device: str, fields: set[str]) -> Callable[[], None]:
+        """Register H-codes read by an enabled entity of a device.
+
+        Fields of devices with registered entities that no entity reads are
+        neither decoded nor, with the field filter, requested.
+
+        Returns:
+        -------
+            A callback that unregisters the fields.
+
+        """
+        refs = self._field_refs.setdefault(device, Counter())
+        refs.update(fields)
+        self._client.wanted_fields[device] = set(refs)
+
+        @callback
+        def _untrack() -> None:
+            refs.subtract(fields)
+            self._client.wanted_fields[device] = set(+refs)
+
+        return _untrack
+
+    @callback
+    def async_start_field_tracking(self) -> None:
+        """Stop polling devices none of whose entities are enabled."""
+        for device in self.data or {}:
+            self._client.wanted_fields.setdefault(device, set())
+
+    def is_device_available(self, device: str) -> bool:
+        """Return whether a device is online and its breaker is closed."""
+        info = (self.data or {}).get(device)
+        if info is None or not info.get("properties", {}).get("connected"):
+            return False
+        return not self._client.device_breaker(device).is_open
+
     def get_client(self) -> Client:
         """ return client"""
         return self._client
+
+
+class ExohomeDeviceCoordinator(ExohomeStaggeredCoordinator):
+    """Define a coordinator for a single device.
+
+    It shares the connection of the account coordinator but has its own
+    interval and error state, so a slow or failing device does not delay
+    the others. Its data is ``{device: info}``, the same shape entities
+    read from the account coordinator.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        account: ExohomeDataUpdateCoordinator,
+        device: str,
+    ) -> None:
+        """Initialize."""
+        client = account.get_client()
+        super().__init__(
+            hass,
+            name=f"{account.name} {device}",
+            update_interval=DEFAULT_SCAN_INTERVAL,
+            seed=f"{client.session_name}:{device}",
+        )
+        self.account = account
+        self.device = device
+        self._client = client
+
+    async def _async_update_data(self) -> dict:
+        """Poll the device, timed, traced and profiled on demand."""
+        start = time.monotonic()
+        with self._client.tracer.trace("device_refresh", device=self.device):
+            try:
+                return await PROFILER.wrap(self._async_poll())
+            finally:
+                self._client.metrics.observe(
+                    "device_refresh", time.monotonic() - start
+                )
+                PROFILER.cycle_done()
+
+    async def _async_poll(self) -> dict:
+        """Poll the device."""
+        if self.device not in self._client.devices:
+            raise UpdateFailed(f"Device {self.device} is no longer listed")
+        if self.account.breaker.is_open:
+            raise UpdateFailed("Exohome cloud unavailable")
+        try:
+            fresh = await self._client.async_poll_device(self.device)
+        except ExohomeError as e:
+            raise UpdateFailed(
+                f"There was a Exohome error while updating {self.device}: {e}"
+            ) from e
+        breaker = self._client.device_breaker(self.device)
+        if not fresh and breaker.failures:
+            raise UpdateFailed(f"Device {self.device} did not answer")
+        self.account.owners.async_notify(self.account, [self.device])
+        await self._client.async_close_if_idle()
+        return {self.device: self._client.devices[self.device]}
+
+    def _refresh_interval(self) -> timedelta | None:
+        """Follow the idle interval of the account while the client is idle."""
+        if self._client.idle:
+            return self.account.idle_poll_interval
+        return self._base_interval
+
+    async def async_set_device(self, device: str, data: dict) -> None:
+        """Send desired H-code values through the account reconciler."""
+        tracer = self._client.tracer
+        with tracer.trace("command", device=device, fields=sorted(data)):
+            if await self.account.async_reconcile(device, data):
+                self.async_update_listeners()
+            else:
+                await self.async_request_refresh()
+
+    @callback
+    def async_track_fields(self, device: str, fields: set[str]) -> Callable[[], None]:
+        """Register H-codes read by an enabled entity with the account."""
+        return self.account.async_track_fields(device, fields)
+
+    def is_device_available(self, device: str) -> bool:
+        """Return whether the device is online and its breaker is closed."""
+        return self.account.is_device_available(device)
+
+    def get_client(self) -> Client:
+        """ return client"""
+        return self._client
+
+
+class ExohomeDeviceOwners:
+    """Define which config entry polls each device shared between accounts.
+
+    The first entry to list a device owns it. Other entries listing the same
+    device skip polling it and receive the status the owner fetches. When
+    the owner unloads or fails to update, another entry listing the device
+    takes over.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._owners: dict[str, ExohomeDataUpdateCoordinator] = {}
+        self._coordinators: list[ExohomeDataUpdateCoordinator] = []
+
+    def _listing(self, device: str) -> list[ExohomeDataUpdateCoordinator]:
+        """Return the coordinators whose account lists a device."""
+        return [
+            coordinator
+            for coordinator in self._coordinators
+            if device in coordinator.get_client().devices
+        ]
+
+    @callback
+    def async_update(self, coordinator: ExohomeDataUpdateCoordinator) -> None:
+        """Claim the devices listed by a coordinator that nobody polls."""
+        if coordinator not in self._coordinators:
+            self._coordinators.append(coordinator)
+        for device in coordinator.get_client().devices:
+            owner = self._owners.get(device)
+            if owner is None or not owner.last_update_success:
+                self._owners[device] = coordinator
+        self._async_rebuild()
+
+    @callback
+    def async_remove(self, coordinator: ExohomeDataUpdateCoordinator) -> None:
+        """Hand the devices of an unloading coordinator to the others."""
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+        for device, owner in list(self._owners.items()):
+            if owner is not coordinator:
+                continue
+            if listing := self._listing(device):
+                self._owners[device] = listing[0]
+            else:
+                del self._owners[device]
+        client = coordinator.get_client()
+        client.polled_elsewhere = set()
+        client.status_subscribers = {}
+        self._async_rebuild()
+
+    @callback
+    def _async_rebuild(self) -> None:
+        """Point each client at the owners and subscribers of its devices."""
+        for coordinator in self._coordinators:
+            client = coordinator.get_client()
+            client.polled_elsewhere = set()
+            client.status_subscribers = {}
+            for device in client.devices:
+                owner = self._owners.get(device)
+                if owner is not None and owner is not coordinator:
+                    client.polled_elsewhere.add(device)
+                elif owner is coordinator:
+                    subscribers = [
+                        other.get_client()
+                        for other in self._listing(device)
+                        if other is not coordinator
+                    ]
+                    if subscribers:
+                        client.status_subscribers[device] = subscribers
+
+    @callback
+    def async_notify(
+        self, coordinator: ExohomeDataUpdateCoordinator, devices: list[str]
+    ) -> None:
+        """Update the listeners of entries sharing devices just polled."""
+        for other in self._coordinators:
+            if other is coordinator:
+                continue
+            shared = other.get_client().polled_elsewhere.intersection(devices)
+            if not shared:
+                continue
+            other.async_update_listeners()
+            for device in shared:
+                if device in other.device_coordinators:
+                    other.device_coordinators[device].async_update_listeners()
@@ -0,0 +1,285 @@
+"""Define a benchmark of the connection to the Exohome cloud."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+import websockets
+
+from .decode import decode_frame
+from .errors import RequestError
+
+if TYPE_CHECKING:
+    from .ratelimit import RateLimiter
+
+DEFAULT_TIMEOUT = 10
+SLOWEST_DEVICES = 5
+
+
+def summarize(samples: list[float]) -> dict[str, Any]:
+    """Return the count and distribution of round trip times in seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 6)
+
+    return {
+        "count": len(ordered),
+        "min": round(ordered[0], 6),
+        "mean": round(sum(ordered) / len(ordered), 6),
+        "p50": rank(0.5),
+        "p95": rank(0.95),
+        "max": round(ordered[-1], 6),
+    }
+
+
+class ConnectionBenchmark:
+    """Define a benchmark run over a websocket of its own.
+
+    The socket is opened, logged in and closed by the benchmark, so the
+    shared connection, its scheduler and its metrics are left alone. Its
+    requests are still paced by the rate limiter of the account, if given.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        token: str,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            connect: Opens a websocket to the ``/phone`` endpoint.
+            token: The session token to log in with.
+            timeout: Seconds to wait for each response.
+            rate_limiter: Paces the reads and the set, if given.
+
+        """
+        self._connect = connect
+        self._token = token
+        self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        self._rate_wait = 0.0
+        self._ws: Any = None
+        self._reader: asyncio.Task | None = None
+        self._inflight: dict[int, tuple[str, asyncio.Future]] = {}
+        self._id = 0
+
+    async def async_run(
+        self,
+        *,
+        samples: int = 1,
+        concurrency: int = 1,
+        noop_set: str | None = None,
+        field: str | None = None,
+    ) -> dict[str, Any]:
+        """Time connecting, logging in, listing and reading every device.
+
+        Args:
+        ----
+            samples: The number of ``get`` requests sent per device.
+            concurrency: The number of ``get`` requests in flight at once.
+            noop_set: A device to send its own current value to, if any.
+            field: The H-code whose current value ``noop_set`` writes back.
+
+        Returns:
+        -------
+            The timings, in seconds.
+
+        Raises:
+        ------
+            RequestError: Raised when connecting, logging in or listing fails.
+
+        """
+        result: dict[str, Any] = {"started": datetime.now(UTC).isoformat()}
+        start = time.monotonic()
+        try:
+            self._ws = await self._connect()
+        except (OSError, websockets.exceptions.WebSocketException) as err:
+            msg = f"Unable to connect: {err}"
+            raise RequestError(msg) from err
+        # Includes DNS, TCP, TLS and the websocket upgrade.
+        result["connect_s"] = round(time.monotonic() - start, 6)
+        self._reader = asyncio.get_running_loop().create_task(self._async_read())
+        try:
+            rtt, response = await self._async_request(
+                "login", data={"token": self._token}
+            )
+            if response.get("status") not in (None, "ok"):
+                msg = f"Login failed: {response.get('status')}"
+                raise RequestError(msg)
+            result["login_s"] = round(rtt, 6)
+
+            rtt, response = await self._async_request("lst_device")
+            result["lst_device_s"] = round(rtt, 6)
+            devices = [
+                dev["device"]
+                for dev in response.get("data") or []
+                if isinstance(dev, dict)
+                and dev.get("device")
+                and dev.get("properties", {}).get("connected", True)
+            ]
+            result["devices"] = len(devices)
+
+            statuses: dict[str, dict] = {}
+            result.update(
+                await self._async_gets(devices, samples, concurrency, statuses)
+            )
+            if noop_set is not None and field is not None:
+                result["set"] = await self._async_noop_set(
+                    noop_set, field, statuses.get(noop_set)
+                )
+        finally:
+            await self._async_close()
+        if self._rate_limiter is not None:
+            result["rate_limited_s"] = round(self._rate_wait, 6)
+        result["total_s"] = round(time.monotonic() - start, 6)
+        return result
+
+    async def _async_gets(
+        self,
+        devices: list[str],
+        samples: int,
+        concurrency: int,
+        statuses: dict[str, dict],
+    ) -> dict[str, Any]:
+        """Read every device ``samples`` times, ``concurrency`` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+        rtts: list[float] = []
+        slowest: dict[str, float] = {}
+        failures = 0
+
+        async def _get(device: str) -> None:
+            nonlocal failures
+            async with semaphore:
+                await self._async_pace(device)
+                try:
+                    rtt, response = await self._async_request("get", device=device)
+                except RequestError:
+                    failures += 1
+                    return
+            if response.get("status") != "ok":
+                failures += 1
+                return
+            rtts.append(rtt)
+            slowest[device] = max(slowest.get(device, 0.0), rtt)
+            data = response.get("data")
+            if isinstance(data, dict) and isinstance(data.get("status"), dict):
+                statuses[device] = data["status"]
+
+        start = time.monotonic()
+        await asyncio.gather(
+            *(_get(device) for _ in range(samples) for device in devices)
+        )
+        return {
+            "get_s": summarize(rtts),
+            "get_failures": failures,
+            "get_wall_s": round(time.monotonic() - start, 6),
+            "concurrency": concurrency,
+            "slowest": [
+                {"device": device, "rtt_s": round(rtt, 6)}
+                for device, rtt in sorted(
+                    slowest.items(), key=lambda item: item[1], reverse=True
+                )[:SLOWEST_DEVICES]
+            ],
+        }
+
+    async def _async_noop_set(
+        self, device: str, field: str, status: dict | None
+    ) -> dict[str, Any]:
+        """Set one H-code of a device to the value it already has."""
+        if not status:
+            return {"device": device, "field": field, "error": "no status read"}
+        if field not in status:
+            return {"device": device, "field": field, "error": "field not reported"}
+        await self._async_pace(device)
+        try:
+            rtt, response = await self._async_request(
+                "set", device=device, data={field: status[field]}
+            )
+        except RequestError as err:
+            return {"device": device, "field": field, "error": str(err)}
+        return {
+            "device": device,
+            "field": field,
+            "status": response.get("status"),
+            "rtt_s": round(rtt, 6),
+        }
+
+    async def _async_pace(self, device: str) -> None:
+        """Wait for the rate limiter, outside of the timed round trip."""
+        if self._rate_limiter is not None:
+            self._rate_wait += await self._rate_limiter.acquire(device)
+
+    async def _async_request(
+        self, request: str, *, device: str | None = None, data: dict | None = None
+    ) -> tuple[float, dict]:
+        """Send a request and return its round trip time and response."""
+        self._id += 1
+        id = self._id
+        frame: dict[str, Any] = {"id": id, "request": request}
+        if device:
+            frame["device"] = device
+        if data:
+            frame["data"] = data
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[id] = (request, fut)
+        start = time.monotonic()
+        try:
+            await self._ws.send(json.dumps(frame))
+            async with asyncio.timeout(self._timeout):
+                response = await fut
+        except TimeoutError as err:
+            msg = f"Timed out waiting for {request}"
+            raise RequestError(msg) from err
+        except websockets.exceptions.ConnectionClosed as err:
+            msg = f"Connection closed while waiting for {request}: {err}"
+            raise RequestError(msg) from err
+        finally:
+            self._inflight.pop(id, None)
+        return time.monotonic() - start, response
+
+    async def _async_read(self) -> None:
+        """Hand each response to its request; pushes are ignored."""
+        error: Exception | None = None
+        try:
+            async for text in self._ws:
+                try:
+                    frame = decode_frame(text)
+                except ValueError:
+                    continue
+                if not isinstance(frame, dict) or not frame.get("status"):
+                    continue
+                # Match responses the way the client does, falling back to
+                # the oldest request of the same verb without an id.
+                for id, (request, fut) in self._inflight.items():
+                    if (
+                        not fut.done()
+                        and frame.get("response") == request
+                        and frame.get("id", id) == id
+                    ):
+                        fut.set_result(frame)
+                        break
+        except websockets.exceptions.ConnectionClosed as err:
+            error = err
+        finally:
+            for _, fut in self._inflight.values():
+                if not fut.done():
+                    fut.set_exception(RequestError(f"Connection closed: {error}"))
+
+    async def _async_close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            self._reader.cancel()
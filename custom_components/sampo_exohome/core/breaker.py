@@ -0,0 +1,117 @@
+"""Define a circuit breaker with exponential backoff."""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+REASON_FAILURES = "failures"
+REASON_OFFLINE = "offline"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BASE_BACKOFF = 60.0
+DEFAULT_MAX_BACKOFF = 1800.0
+
+
+class CircuitBreaker:
+    """Define a circuit breaker.
+
+    The breaker opens after ``failure_threshold`` consecutive failures, or
+    immediately when tripped. While open, ``allow`` refuses requests until
+    the backoff expires and then lets a single probe through (half-open).
+    A failed probe doubles the backoff, up to ``max_backoff``.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        jitter: float = 0.0,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            failure_threshold: Consecutive failures that open the breaker.
+            base_backoff: Seconds to stay open after the first trip.
+            max_backoff: The upper bound of the backoff.
+            jitter: The fraction of the backoff to randomize, e.g. 0.2.
+
+        """
+        self._failure_threshold = failure_threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self.state = STATE_CLOSED
+        self.reason: str | None = None
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+        self._next_probe = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether requests are currently refused."""
+        return self.state == STATE_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is allowed."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(self._next_probe - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == STATE_OPEN and time.monotonic() >= self._next_probe:
+            self.state = STATE_HALF_OPEN
+        return self.state != STATE_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = STATE_CLOSED
+        self.reason = None
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker when needed."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self._failure_threshold:
+            self.trip(REASON_FAILURES)
+
+    def trip(self, reason: str = REASON_FAILURES) -> None:
+        """Open the breaker and schedule the next probe."""
+        self.trips += 1
+        backoff = min(
+            self._base_backoff * 2 ** (self.trips - 1), self._max_backoff
+        )
+        if self._jitter:
+            backoff *= 1 + random.uniform(-self._jitter, self._jitter)
+        self.backoff = backoff
+        self.state = STATE_OPEN
+        self.reason = reason
+        self._next_probe = time.monotonic() + backoff
+
+    def probe_now(self) -> None:
+        """Allow a probe on the next ``allow`` call."""
+        self._next_probe = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state."""
+        return {
+            "state": self.state,
+            "reason": self.reason,
+            "failures": self.failures,
+            "trips": self.trips,
+            "backoff": round(self.backoff, 1),
+            "retry_in": round(self.retry_in, 1),
+        }
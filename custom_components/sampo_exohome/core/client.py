@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from datetime import datetime, timedelta
+from functools import partial
 from http import HTTPStatus
 from typing import Any, TypeVar, cast
 from uuid import uuid4
 import json
+import os
+import time
 import websockets
 
 from aiohttp import ClientSession, ClientTimeout
@@ -19,22 +23,72 @@ from mashumaro.exceptions import (
     UnserializableDataError,
 )
 
-from .errors import InvalidCredentialsError, RequestError
+from .errors import (
+    ExohomeError,
+    InvalidCredentialsError,
+    RequestDeferredError,
+    RequestError,
+)
 from .model import AuthenticateViaCredentialsResponse
-from .const import LOGGER
-
-API_BASE = "https://sampo.apps.exosite.io/api:1"
-WSS_BASE = "wss://sampo.apps.exosite.io/api:1"
+from .const import LOGGER, POLL_TIER_SLOW, field_poll_tier
+from .benchmark import ConnectionBenchmark
+from .breaker import REASON_OFFLINE, STATE_CLOSED, CircuitBreaker
+from .decode import async_decode_frame, decode_frame
+from .ingest import PushIngest
+from .metrics import Metrics
+from .profiler import PROFILER
+from .ratelimit import RateLimiter
+from .recorder import DIRECTION_IN, DIRECTION_OUT, FrameRecorder
+from .tracing import Tracer
+from .scheduler import PRIORITY_COMMAND, PRIORITY_POLL, RequestScheduler
+
+# Both can be pointed at a local stand-in, e.g. tools/fake_exosite.py.
+API_BASE = os.environ.get("EXOHOME_API_BASE", "https://sampo.apps.exosite.io/api:1")
+WSS_BASE = os.environ.get("EXOHOME_WSS_BASE", "wss://sampo.apps.exosite.io/api:1")
 
 DEFAULT_TIMEOUT = 10
+DEFAULT_CONCURRENCY = 8
+DEVICE_POLL_TIMEOUT = 3
+SLOW_TIER_EVERY = 10
+DEFAULT_CONFIRM_TIMEOUT = 10
+CONFIRM_POLL_INITIAL = 0.5
+CONFIRM_POLL_MAX = 2.0
+CONFIRM_HISTORY = 200
+READ_BATCH = 64
+DEFAULT_CHUNKED_THRESHOLD = 64 * 1024
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+FRAME_HISTORY = 50
+
+# Resolves a confirmation waiter whose values a newer set overrode.
+SUPERSEDED = object()
 
 ExohomeBaseModelT = TypeVar("ExohomeBaseModelT", bound=DataClassDictMixin)
 
+
+def normalize_value(value: Any) -> Any:
+    """Return a value in a form comparable with reported status."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return normalize_value(float(value))
+        except ValueError:
+            return value
+    return value
+
+
 class Client:
     """Define the API object."""
 
     def __init__(
-        self, *, session: ClientSession | None = None, session_name: str | None = None
+        self,
+        *,
+        session: ClientSession | None = None,
+        session_name: str | None = None,
+        api_base: str | None = None,
+        wss_base: str | None = None,
     ) -> None:
         """Initialize.
 
@@ -42,8 +96,12 @@ class Client:
         ----
             session: An optional aiohttp ClientSession.
             session_name: An optional session name to use for authentication.
+            api_base: An optional REST base URL instead of API_BASE.
+            wss_base: An optional websocket base URL instead of WSS_BASE.
 
         """
+        self._api_base = api_base or API_BASE
+        self._wss_base = wss_base or WSS_BASE
         self._provision_token: str | None = None
         self._provision_token_expires_in: datetime | None = None
         self._session = session
@@ -57,6 +115,92 @@ class Client:
         self.ws = None
         self.devices: dict = {}
         self._ws_id = 0
+        self._connected = False
+        self._reader: asyncio.Task | None = None
+        self._inflight: dict[int, tuple[str, asyncio.Future]] = {}
+        self.ingest = PushIngest(self._apply_pushed, resync=self._resync_device)
+        # Frames larger than this many characters are decoded in slices.
+        self.chunked_threshold = DEFAULT_CHUNKED_THRESHOLD
+        self.decode_stats: dict[str, float] = {
+            "inline": 0,
+            "inline_max": 0.0,
+            "chunked": 0,
+            "chunked_max": 0.0,
+            "merge_max": 0.0,
+        }
+        self._scheduler = RequestScheduler()
+        self.rate_limiter = RateLimiter()
+        self._confirm_waiters: dict[str, list[tuple[dict, asyncio.Future]]] = {}
+        self.confirm_latency: deque[float] = deque(maxlen=CONFIRM_HISTORY)
+        self.confirm_timeouts = 0
+        self._device_breakers: dict[str, CircuitBreaker] = {}
+        self.field_filter = False
+        self._poll_count: dict[str, int] = {}
+        self._slow_tier_due: set[str] = set()
+        # H-codes read by enabled entities, per device. Devices missing here
+        # are decoded in full.
+        self.wanted_fields: dict[str, set[str]] = {}
+        # Devices shared with other accounts: those another client polls for
+        # us, and the clients we pass our polled status on to.
+        self.polled_elsewhere: set[str] = set()
+        self.status_subscribers: dict[str, list[Client]] = {}
+        # Seconds without commands before the socket is closed; 0 keeps it open.
+        self.idle_timeout = 0.0
+        self._last_command = time.monotonic()
+        # Opens the websocket; a Replay's connect can stand in for it.
+        self.connect_transport = websockets.connect
+        self.recorder: FrameRecorder | None = None
+        self.metrics = Metrics()
+        self.tracer = Tracer()
+        self.benchmark: dict[str, Any] | None = None
+        # The latest frames in both directions, kept as sent or received so
+        # collecting them costs an append; redacted when read.
+        self.frame_history: deque[tuple[float, str, str | bytes]] = deque(
+            maxlen=FRAME_HISTORY
+        )
+        # Monotonic time each device's status last changed, and how long
+        # its last poll took.
+        self.last_update: dict[str, float] = {}
+        self.fetch_latency: dict[str, float] = {}
+
+    @property
+    def idle(self) -> bool:
+        """Return whether the idle policy applies.
+
+        The client is idle once no command has been sent for
+        ``idle_timeout`` seconds and no write is waiting for pushed status.
+        """
+        if not self.idle_timeout:
+            return False
+        if any(self._confirm_waiters.values()):
+            return False
+        return time.monotonic() - self._last_command >= self.idle_timeout
+
+    def _mark_active(self) -> None:
+        """Record that a command is being sent."""
+        self._last_command = time.monotonic()
+
+    async def async_close_if_idle(self) -> bool:
+        """Close the socket when the idle policy applies.
+
+        The next request reopens it with only the login frame, reusing the
+        cached token instead of provisioning a new session.
+
+        Returns:
+        -------
+            Whether the socket was closed.
+
+        """
+        if self.ws is None or not self.idle or self._scheduler.busy:
+            return False
+        LOGGER.debug("Closing idle connection of %s", self._email)
+        await self.ws_close()
+        return True
+
+    @property
+    def session_name(self) -> str:
+        """Return the session name."""
+        return self._session_name
 
     async def async_set_token(
         self, email: str, password: str, token: str, expires_at: int
@@ -131,7 +275,7 @@ class Client:
             RequestError: Raised upon an underlying HTTP error.
 
         """
-        url: str = f"{API_BASE}{endpoint}"
+        url: str = f"{self._api_base}{endpoint}"
 
         headers = {}
         session = ClientSession(timeout=ClientTimeout(total=DEFAULT_TIMEOUT))
@@ -239,25 +383,342 @@ class Client:
             datas["data"] = data
         return datas
 
-    async def _ws_write(self, msg: dict) -> dict:
+    async def _ws_write(
+        self, msg: dict, timeout: float = DEFAULT_TIMEOUT, attempts: int = 2
+    ) -> dict:
         id = msg["id"]
         request = msg["request"]
-        for i in range(0, 2):
-            await self.ws.send(json.dumps(msg))
-            #if msg.get("device"):
-            #    await asyncio.sleep(.1)
-            try:
-                text = await self.ws.recv()
-                response = json.loads(text)
-            except websockets.exceptions.ConnectionClosed as err:
-                msg = f"Error while parsing response from {msg}: {err}"
-            except Exception as err:
-                msg = f"Error while parsing response from {msg}: {err}"
-                raise RequestError(msg) from err
-            if response.get("status"):
-                if request == response.get("response"):
-                    return response
-        return {}
+        device = msg.get("device")
+        with self.tracer.span("request", verb=request, device=device) as span:
+            for i in range(0, attempts):
+                if i:
+                    self.metrics.inc("retries")
+                fut = self._expect(id, request)
+                try:
+                    await self._ws_send(msg)
+                    async with asyncio.timeout(timeout):
+                        response = await fut
+                        if span is not None:
+                            span.set(attempts=i + 1, status=response.get("status"))
+                        return response
+                except TimeoutError:
+                    self.metrics.inc("timeouts")
+                    LOGGER.debug("Timed out waiting for %s (%s)", request, id)
+                except websockets.exceptions.ConnectionClosed as err:
+                    self._connected = False
+                    msg = f"Connection closed while waiting for {request}: {err}"
+                    raise RequestError(msg) from err
+                finally:
+                    self._inflight.pop(id, None)
+            if span is not None:
+                span.set(attempts=attempts, status="timeout")
+            return {}
+
+    async def _ws_write_many(self, msgs: list[dict]) -> dict[int, dict]:
+        """Send several requests back to back and collect their responses.
+
+        Responses are matched by id; a response without an id is taken as
+        the answer to the oldest outstanding request with the same verb.
+        """
+        futs = {msg["id"]: self._expect(msg["id"], msg["request"]) for msg in msgs}
+        try:
+            with self.tracer.span("requests", count=len(msgs)):
+                for msg in msgs:
+                    await self._ws_send(msg)
+                await asyncio.wait(futs.values(), timeout=DEFAULT_TIMEOUT)
+        except websockets.exceptions.ConnectionClosed as err:
+            self._connected = False
+            msg = f"Connection closed while waiting for responses: {err}"
+            raise RequestError(msg) from err
+        finally:
+            for id in futs:
+                self._inflight.pop(id, None)
+        responses = {}
+        for id, fut in futs.items():
+            if not fut.done():
+                continue
+            if fut.exception() is not None:
+                raise fut.exception()
+            responses[id] = fut.result()
+        if len(responses) < len(futs):
+            self.metrics.inc("timeouts", len(futs) - len(responses))
+            LOGGER.debug("Timed out waiting for %s responses", len(futs) - len(responses))
+        return responses
+
+    async def _ws_send(self, msg: dict) -> None:
+        text = json.dumps(msg)
+        self.frame_history.append((time.time(), DIRECTION_OUT, text))
+        if self.recorder is not None:
+            self.recorder.record(DIRECTION_OUT, text)
+        self.metrics.inc("frames_out")
+        self.metrics.inc("bytes_out", len(text))
+        await self.ws.send(text)
+
+    def _expect(self, id: int, request: str) -> asyncio.Future:
+        """Register a future for the response to a request.
+
+        The round trip time is recorded per verb once the response arrives.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(partial(self._observe_rtt, request, time.monotonic()))
+        self._inflight[id] = (request, fut)
+        return fut
+
+    def _observe_rtt(self, request: str, sent: float, fut: asyncio.Future) -> None:
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        rtt = time.monotonic() - sent
+        self.metrics.observe("rtt", rtt)
+        self.metrics.observe(f"rtt.{request}", rtt)
+
+    async def _async_read(self, ws) -> None:
+        """Read every frame of a websocket until it closes.
+
+        Responses resolve the request waiting for them; everything else is
+        handled as a push. The loop yields after each batch of frames so a
+        burst does not stall the event loop.
+        """
+        count = 0
+        error: Exception | None = None
+        try:
+            async for text in ws:
+                self.frame_history.append((time.time(), DIRECTION_IN, text))
+                if self.recorder is not None:
+                    self.recorder.record(DIRECTION_IN, text)
+                self.metrics.inc("frames_in")
+                self.metrics.inc("bytes_in", len(text))
+                try:
+                    frame = await PROFILER.wrap(self._async_decode(text))
+                except ValueError:
+                    LOGGER.debug("Ignoring malformed frame: %s", text)
+                    continue
+                if isinstance(frame, dict):
+                    with PROFILER.section():
+                        if not self._resolve(frame):
+                            self._handle_unsolicited(frame)
+                count += 1
+                if count % READ_BATCH == 0:
+                    await asyncio.sleep(0)
+        except websockets.exceptions.ConnectionClosed as err:
+            error = err
+        finally:
+            if self.ws is ws or self.ws is None:
+                self._connected = False
+                msg = f"Connection closed while waiting for a response: {error}"
+                for _, fut in self._inflight.values():
+                    if not fut.done():
+                        fut.set_exception(RequestError(msg))
+
+    async def _async_decode(self, text: str | bytes) -> Any:
+        """Decode a frame, in slices when it is large.
+
+        The longest time the event loop was blocked is recorded in
+        ``decode_stats``.
+        """
+        if len(text) > self.chunked_threshold:
+            frame, blocked = await async_decode_frame(text)
+            kind = "chunked"
+        else:
+            start = time.perf_counter()
+            frame = decode_frame(text)
+            blocked = time.perf_counter() - start
+            kind = "inline"
+        self.decode_stats[kind] += 1
+        self.decode_stats[f"{kind}_max"] = max(
+            self.decode_stats[f"{kind}_max"], blocked
+        )
+        return frame
+
+    def _resolve(self, frame: dict) -> bool:
+        """Hand a frame to the request it answers, if any."""
+        for id, (request, fut) in self._inflight.items():
+            if not fut.done() and self._is_response(frame, id, request):
+                fut.set_result(frame)
+                return True
+        return False
+
+    @staticmethod
+    def _is_response(frame: dict, id: int, request: str) -> bool:
+        """Return whether a frame answers the given request."""
+        if not frame.get("status") or frame.get("response") != request:
+            return False
+        return frame.get("id", id) == id
+
+    def _handle_unsolicited(self, frame: dict) -> None:
+        """Handle a frame that does not answer the pending request."""
+        LOGGER.debug("Unsolicited frame: %s", frame)
+        data = frame.get("data")
+        if not isinstance(data, dict):
+            return
+        device = frame.get("device") or data.get("device")
+        status = data.get("status")
+        if device in self.devices and isinstance(status, dict):
+            self.ingest.put(device, status)
+            if self._confirm_waiters.get(device):
+                # A command is waiting for this report; skip the batch tick.
+                self.ingest.flush()
+
+    def _apply_pushed(self, device: str, status: dict) -> None:
+        """Merge a batch of pushed values for a device that is still listed."""
+        if device in self.devices:
+            self._apply_status(device, status)
+
+    def _resync_device(self, device: str) -> None:
+        """Re-read every field of a device on its next poll."""
+        self._slow_tier_due.add(device)
+
+    def _apply_status(self, device: str, status: dict) -> None:
+        """Merge a status report into the cached device."""
+        properties = self.devices[device].setdefault("properties", {})
+        properties.setdefault("status", {}).update(self._wanted_status(device, status))
+        self.last_update[device] = time.monotonic()
+        self._check_confirm(device)
+        self._share_status(device, status)
+
+    def _share_status(self, device: str, status: dict) -> None:
+        """Pass a status report on to the clients sharing the device."""
+        for client in self.status_subscribers.get(device, ()):
+            if device in client.devices:
+                client._apply_status(device, status)
+
+    def _wanted(self, device: str) -> set[str] | None:
+        """Return the H-codes read for a device, or None for all of them.
+
+        Fields read by the clients sharing the device are included.
+        """
+        wanted = self.wanted_fields.get(device)
+        for client in self.status_subscribers.get(device, ()):
+            other = client.wanted_fields.get(device)
+            if wanted is None or other is None:
+                return None
+            wanted = wanted | other
+        return wanted
+
+    def _wanted_status(self, device: str, status: dict) -> dict:
+        """Drop H-codes that no enabled entity reads and no write awaits."""
+        wanted = self._wanted(device)
+        if wanted is None:
+            return status
+        awaited = {
+            key for data, _ in self._confirm_waiters.get(device, []) for key in data
+        }
+        return {
+            key: value
+            for key, value in status.items()
+            if key in wanted or key in awaited
+        }
+
+    def _check_confirm(self, device: str) -> None:
+        """Resolve confirmation waiters whose values are now reported."""
+        waiters = self._confirm_waiters.get(device)
+        if not waiters:
+            return
+        status = self.devices[device].get("properties", {}).get("status", {})
+        for data, fut in list(waiters):
+            if fut.done():
+                waiters.remove((data, fut))
+            elif all(
+                key in status
+                and normalize_value(status[key]) == normalize_value(value)
+                for key, value in data.items()
+            ):
+                fut.set_result(None)
+                waiters.remove((data, fut))
+
+    def _supersede_confirm(self, device: str, data: dict) -> None:
+        """Stop waiting for H-codes that a newer set overrides.
+
+        A waiter left with nothing to confirm is resolved as superseded, so
+        an older write does not wait out its timeout for a value the device
+        will never report.
+        """
+        for awaited, fut in list(self._confirm_waiters.get(device, [])):
+            if fut.done():
+                continue
+            for key in data:
+                awaited.pop(key, None)
+            if not awaited:
+                fut.set_result(SUPERSEDED)
+                self._confirm_waiters[device].remove((awaited, fut))
+
+    async def _async_connect(self) -> None:
+        """Open and log in the shared websocket, if it is not open yet."""
+        if self.ws is not None and self._connected:
+            return
+
+        with self.tracer.span("connect"):
+            await self._async_open()
+
+    async def _async_open_transport(self) -> Any:
+        """Open a websocket to the ``/phone`` endpoint."""
+        return await self.connect_transport(
+            f"{self._wss_base}/phone",
+            ssl=self._default_context
+            if self._wss_base.startswith("wss:")
+            else None,
+            close_timeout=3,
+            max_size=MAX_FRAME_SIZE,
+        )
+
+    async def _async_open(self) -> None:
+        try:
+            self.ws = await self._async_open_transport()
+        except (OSError, websockets.exceptions.WebSocketException) as err:
+            self.metrics.inc("connect_failures")
+            msg = f"Unable to connect to {self._wss_base}: {err}"
+            raise RequestError(msg) from err
+        if self.metrics.counter("connects"):
+            self.metrics.inc("reconnects")
+        self.metrics.inc("connects")
+        self._connected = True
+        self._reader = asyncio.get_running_loop().create_task(
+            self._async_read(self.ws)
+        )
+
+        self._ws_id = self._ws_id + 1
+        msg = self._format_msg(self._ws_id, "login", data={"token": self.token})
+        response = await self._ws_write(msg)
+        if response.get("status") not in (None, "ok"):
+            await self.ws_close()
+            msg = f"Login failed: {response.get('status')}"
+            raise InvalidCredentialsError(msg)
+
+    async def _async_request(
+        self,
+        request: str,
+        *,
+        device: str | None = None,
+        data: dict | None = None,
+        priority: int = PRIORITY_COMMAND,
+        timeout: float = DEFAULT_TIMEOUT,
+        attempts: int = 2,
+    ) -> dict:
+        """Send one request over the shared websocket.
+
+        Args:
+        ----
+            request: The websocket verb.
+            device: An optional device id.
+            data: An optional payload.
+            priority: The scheduler priority of the request.
+            timeout: Seconds to wait for the response of each attempt.
+            attempts: The number of times the request is sent.
+
+        Returns:
+        -------
+            The response frame, or an empty dict if none arrived.
+
+        Raises:
+        ------
+            RequestDeferredError: Raised when a background request is dropped.
+            RequestError: Raised upon a connection error.
+
+        """
+        async with self._scheduler.slot(priority):
+            await self._async_connect()
+            self._ws_id = self._ws_id + 1
+            msg = self._format_msg(self._ws_id, request, device=device, data=data)
+            return await self._ws_write(msg, timeout, attempts)
 
     async def ws_connect(self, default_context):
         """websocket connect.
@@ -271,28 +732,70 @@ class Client:
             ApiError: If an API error occurs.
         """
         self._default_context = default_context
-        async with websockets.connect(f"{WSS_BASE}/phone", ssl=self._default_context, close_timeout=3) as websocket:
-            self.ws = websocket
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "login", data={"token": self.token})
-            response = await self._ws_write(msg)
+        response = await self._async_request(
+            "provision_token", data={"expires_in": 2592000})
+        if isinstance(response, dict) and response.get("status") == "ok":
+            self._provision_token = response["data"]["token"]
+            self._provision_token_expires_in = response["data"]["expires_in"]
 
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "provision_token", data={"expires_in": 2592000})
-            response = await self._ws_write(msg)
-            if isinstance(response, dict) and response["status"] == "ok":
-                self._provision_token = response["data"]["token"]
-                self._provision_token_expires_in = response["data"]["expires_in"]
+        await self._async_request("get_user_data")
+        await self._async_request("get_me")
 
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "get_user_data")
-            response = await self._ws_write(msg)
+        LOGGER.debug(f"token: {self._provision_token}, expires_in: {self._provision_token_expires_in}")
 
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "get_me")
-            response = await self._ws_write(msg)
+    def connection_state(self) -> dict[str, Any]:
+        """Return the state of the shared websocket."""
+        return {
+            "connected": self._connected,
+            "socket_open": self.ws is not None,
+            "reader_running": self._reader is not None and not self._reader.done(),
+            "inflight": len(self._inflight),
+            "idle": self.idle,
+            "seconds_since_command": round(time.monotonic() - self._last_command, 1),
+            "recording": self.recorder is not None,
+        }
 
-        LOGGER.debug(f"token: {self._provision_token}, expires_in: {self._provision_token_expires_in}")
+    async def async_benchmark(self, **kwargs: Any) -> dict[str, Any]:
+        """Measure the connection to the cloud over a websocket of its own.
+
+        The result is also kept in ``benchmark``.
+
+        Args:
+        ----
+            **kwargs: Passed on to ConnectionBenchmark.async_run.
+
+        Returns:
+        -------
+            The timings, in seconds.
+
+        """
+        benchmark = ConnectionBenchmark(
+            self._async_open_transport, self.token, rate_limiter=self.rate_limiter
+        )
+        self.benchmark = await benchmark.async_run(**kwargs)
+        return self.benchmark
+
+    def start_recording(self, path: str, **kwargs: Any) -> FrameRecorder:
+        """Write every websocket frame from now on to a file.
+
+        Args:
+        ----
+            path: The file to write.
+            **kwargs: Passed on to FrameRecorder.
+
+        Returns:
+        -------
+            The recorder.
+
+        """
+        self.recorder = FrameRecorder(path, **kwargs)
+        return self.recorder
+
+    async def async_stop_recording(self) -> None:
+        """Stop recording and write out the buffered frames."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            await recorder.async_close()
 
     async def ws_close(self):
         """websocket close.
@@ -302,12 +805,28 @@ class Client:
         Raises:
 
         """
+        self._connected = False
         if self.ws:
             await self.ws.close()
+            self.ws = None
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        self.ingest.flush()
 
-    async def get_all_devices(self):
+    async def get_all_devices(self, fetch_status: bool = True):
         """Get all devices.
 
+        Background polls run at the lowest priority, so queued commands are
+        sent first; a poll dropped by the scheduler keeps the last known data
+        for that device. Devices whose breaker is open are skipped until
+        their next probe.
+
+        Args:
+        ----
+            fetch_status: Whether to poll each device after listing them.
+                Without it only the roster is refreshed, in place.
+
         Returns:
             A list of all device.
 
@@ -319,43 +838,211 @@ class Client:
         devices = []
         new_devices = {}
         if self._expires_at - int(datetime.now().timestamp()) <= 0:
-            self.async_authenticate_from_credentials(self._email, self._password)
-
-        async with websockets.connect(f"{WSS_BASE}/phone", ssl=self._default_context, close_timeout=3) as websocket:
-            self.ws = websocket
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "login", data={"token": self.token})
-            response = await self._ws_write(msg)
-
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "lst_device")
-            response = await self._ws_write(msg)
-            if isinstance(response, dict) and response.get("status") == "ok":
-                devices = response["data"]
-
-            await self.ws.recv()
-
-            for dev in devices:
-                device = dev.get("device", None)
-                if device is None:
-                    continue
-                msg = self._format_msg(self._ws_id, "get", device=device)
-                self._ws_id = self._ws_id + 1
-                response = await self._ws_write(msg)
-                if isinstance(response, dict) and response.get("status") == "ok":
-                    data = response["data"]
-                    if data["device"] == device:
-                        dev["properties"].update(data)
-                        new_devices[device] = dev
+            await self.async_authenticate_from_credentials(self._email, self._password)
+            await self.ws_close()
+
+        # The roster is needed to poll anything, so it is never deferred.
+        response = await self._async_request("lst_device")
+        if isinstance(response, dict) and response.get("status") == "ok":
+            devices = response["data"]
+        else:
+            msg = "Unable to list devices"
+            raise RequestError(msg)
+
+        if not fetch_status:
+            start = time.perf_counter()
+            with self.tracer.span("merge", devices=len(devices)):
+                self._merge_roster(devices)
+            self.decode_stats["merge_max"] = max(
+                self.decode_stats["merge_max"], time.perf_counter() - start
+            )
+            return self.devices
+
+        for dev in devices:
+            device = dev.get("device", None)
+            if device is None:
+                continue
+            if await self._async_poll(dev):
+                new_devices[device] = dev
         if len(new_devices) >= 1:
             for device, info in new_devices.items():
                 self.devices[device] = info
+                self._check_confirm(device)
 
         return self.devices
 
+    def _merge_roster(self, devices: list[dict]) -> None:
+        """Merge a device list into the cache in place."""
+        for dev in devices:
+            device = dev.get("device", None)
+            if device is None:
+                continue
+            if device in self.devices:
+                self.devices[device]["properties"].update(dev.get("properties", {}))
+            else:
+                self._keep_status(dev)
+                self.devices[device] = dev
+
+    async def async_poll_device(self, device: str) -> bool:
+        """Poll one listed device in place.
+
+        Returns:
+        -------
+            Whether the device answered with a fresh status.
+
+        """
+        if not await self._async_poll(self.devices[device]):
+            return False
+        self._check_confirm(device)
+        breaker = self.device_breaker(device)
+        return breaker.state == STATE_CLOSED and breaker.failures == 0
+
+    async def _async_poll(self, dev: dict) -> bool:
+        """Refresh the status of one roster entry through its breaker.
+
+        Returns:
+        -------
+            Whether the entry holds data worth storing.
+
+        """
+        device = dev["device"]
+        breaker = self.device_breaker(device)
+        if not dev.get("properties", {}).get("connected", True):
+            if breaker.reason != REASON_OFFLINE:
+                breaker.trip(REASON_OFFLINE)
+            self._keep_status(dev)
+            return True
+        if breaker.is_open and breaker.reason == REASON_OFFLINE:
+            # The cloud reports the device back online.
+            breaker.probe_now()
+        if not breaker.allow():
+            self._keep_status(dev)
+            return True
+        if device in self.polled_elsewhere:
+            # The account that owns this device shares its status with us.
+            self._keep_status(dev)
+            return True
+        if self._wanted(device) == set():
+            # Every entity of the device is disabled.
+            self._keep_status(dev)
+            return True
+        slow_due = self._is_slow_tier_due(device)
+        request_data = None
+        if self.field_filter:
+            fields = self._request_fields(dev, slow_due)
+            if fields == []:
+                # No enabled field is due on this poll.
+                self._poll_count[device] = self._poll_count.get(device, 0) + 1
+                self._slow_tier_due.discard(device)
+                self._keep_status(dev)
+                return True
+            if fields is not None:
+                request_data = {"fields": fields}
+        start = time.monotonic()
+        try:
+            with self.tracer.span("poll", device=device):
+                response = await self._async_request(
+                    "get", device=device, data=request_data, priority=PRIORITY_POLL,
+                    timeout=DEVICE_POLL_TIMEOUT, attempts=1)
+        except RequestDeferredError:
+            LOGGER.debug("Poll of %s deferred", device)
+            return False
+        self.fetch_latency[device] = time.monotonic() - start
+        if isinstance(response, dict) and response.get("status") == "ok":
+            data = response.get("data")
+            if (
+                isinstance(data, dict)
+                and data.get("device") == device
+                and isinstance(data.get("status"), dict)
+            ):
+                breaker.record_success()
+                self._poll_count[device] = self._poll_count.get(device, 0) + 1
+                if slow_due:
+                    self._slow_tier_due.discard(device)
+                # A filtered reply only carries some fields; keep the rest.
+                with self.tracer.span("merge", device=device):
+                    old = self.devices.get(device, {}).get("properties", {})
+                    # Drop what no entity reads any more.
+                    kept = self._wanted_status(device, old.get("status", {}))
+                    status = dict(kept)
+                    status.update(self._wanted_status(device, data["status"]))
+                    dev["properties"].update(data)
+                    dev["properties"]["status"] = status
+                    self._share_status(device, data["status"])
+                self.last_update[device] = time.monotonic()
+                return True
+        breaker.record_failure()
+        if breaker.is_open:
+            LOGGER.debug("Device %s is not responding, backing off", device)
+            self._keep_status(dev)
+            return True
+        return False
+
+    def _is_slow_tier_due(self, device: str) -> bool:
+        """Return whether slow-tier fields should be fetched on this poll."""
+        if device in self._slow_tier_due or device not in self._poll_count:
+            return True
+        return self._poll_count[device] % SLOW_TIER_EVERY == 0
+
+    def _request_fields(self, dev: dict, slow_due: bool) -> list[str] | None:
+        """Return the H-codes to ask a device for, or None for all of them."""
+        wanted = self._wanted(dev["device"])
+        if slow_due:
+            if wanted is None:
+                return None
+            fields = list(dev.get("properties", {}).get("fields", []))
+        else:
+            fields = self._fast_fields(dev)
+        if wanted is None:
+            return fields
+        return [field for field in fields if field in wanted]
+
+    @staticmethod
+    def _fast_fields(dev: dict) -> list[str]:
+        """Return the H-codes of a device that are refreshed on every poll."""
+        properties = dev.get("properties", {})
+        fields = properties.get("fields", [])
+        try:
+            device_type = int(properties["profile"]["esh"]["device_id"])
+        except (KeyError, TypeError, ValueError):
+            return list(fields)
+        return [
+            field
+            for field in fields
+            if field_poll_tier(device_type, field) != POLL_TIER_SLOW
+        ]
+
+    async def async_probe(self) -> None:
+        """Check that the cloud answers with a single cheap request.
+
+        Raises:
+        ------
+            RequestError: Raised when the cloud does not answer.
+
+        """
+        response = await self._async_request("get_me", attempts=1)
+        if response.get("status") != "ok":
+            msg = "Exohome cloud did not answer the probe"
+            raise RequestError(msg)
+
+    def device_breaker(self, device: str) -> CircuitBreaker:
+        """Return the circuit breaker of a device."""
+        breaker = self._device_breakers.get(device)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            self._device_breakers[device] = breaker
+        return breaker
+
+    def _keep_status(self, dev: dict) -> None:
+        """Carry the last known status over to a fresh roster entry."""
+        old = self.devices.get(dev["device"], {}).get("properties", {})
+        dev.setdefault("properties", {}).setdefault("status", old.get("status", {}))
+
     async def set_device(self, device, func, value):
         """Set device.
 
+        Commands run at the highest priority and overtake queued polls.
+
         Returns:
 
 
@@ -364,16 +1051,195 @@ class Client:
             ValueError: If the ClientSession or Endpoints are not available.
             ApiError: If an API error occurs.
         """
-        data = {func: value}
-        async with websockets.connect(f"{WSS_BASE}/phone", ssl=self._default_context, close_timeout=3) as websocket:
-            self.ws = websocket
-            self._ws_id = self._ws_id + 1
-            msg = self._format_msg(self._ws_id, "login", data={"token": self.token})
-            await self._ws_write(msg)
+        await self.set_device_data(device, {func: value})
 
-            msg = self._format_msg(self._ws_id, "set", device=device, data=data)
-            self._ws_id = self._ws_id + 1
-            await self._ws_write(msg)
+    async def set_device_data(self, device: str, data: dict) -> None:
+        """Set several H-codes of a device in one request.
+
+        Args:
+        ----
+            device: The device id.
+            data: A map of H-code to value.
+
+        Raises:
+        ------
+            RequestError: Raised when the cloud rejects the request.
+
+        """
+        self._mark_active()
+        await self.rate_limiter.acquire(device)
+        response = await self._async_request("set", device=device, data=data)
+        if not isinstance(response, dict) or response.get("status") != "ok":
+            status = response.get("status") if isinstance(response, dict) else None
+            msg = f"Unable to set {', '.join(data)} on {device}: {status}"
+            raise RequestError(msg)
+        # Re-read configuration fields on the next poll.
+        self._slow_tier_due.add(device)
+
+    async def get_device(self, device: str, *, priority: int = PRIORITY_COMMAND) -> dict:
+        """Get the status of one device.
+
+        Args:
+        ----
+            device: The device id.
+            priority: The scheduler priority of the request.
+
+        Returns:
+        -------
+            The reported status, or an empty dict.
+
+        """
+        response = await self._async_request("get", device=device, priority=priority)
+        if isinstance(response, dict) and response.get("status") == "ok":
+            data = response["data"]
+            if data.get("device") == device and device in self.devices:
+                self._apply_status(device, data.get("status", {}))
+                return data.get("status", {})
+        return {}
+
+    async def set_and_confirm(
+        self, device: str, data: dict, timeout: float = DEFAULT_CONFIRM_TIMEOUT
+    ) -> float | None:
+        """Set H-codes and wait until the device reports the new values.
+
+        A push frame resolves the wait immediately; otherwise targeted gets
+        are sent with a growing interval until ``timeout``.
+
+        Args:
+        ----
+            device: The device id.
+            data: A map of H-code to value.
+            timeout: Seconds to wait for confirmation.
+
+        Returns:
+        -------
+            The command-to-effect latency in seconds, or None if the new
+            state was not confirmed in time. A set overridden by a newer
+            one before it was confirmed returns the time until then.
+
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        waiter = (dict(data), fut)
+        self._supersede_confirm(device, data)
+        self._confirm_waiters.setdefault(device, []).append(waiter)
+
+        with self.tracer.span("confirm", device=device) as span:
+            start = time.monotonic()
+            deadline = start + timeout
+            interval = CONFIRM_POLL_INITIAL
+            try:
+                await self.set_device_data(device, data)
+                while not fut.done():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(
+                            asyncio.shield(fut), min(interval, remaining))
+                    except TimeoutError:
+                        await self.get_device(device)
+                        interval = min(interval * 2, CONFIRM_POLL_MAX)
+            finally:
+                if not fut.done():
+                    fut.cancel()
+                if waiter in self._confirm_waiters.get(device, []):
+                    self._confirm_waiters[device].remove(waiter)
+
+            if fut.cancelled():
+                self.confirm_timeouts += 1
+                LOGGER.debug("Set of %s on %s was not confirmed", data, device)
+                if span is not None:
+                    span.set(confirmed=False)
+                return None
+
+            latency = time.monotonic() - start
+            if fut.result() is SUPERSEDED:
+                LOGGER.debug("Set of %s on %s was superseded", data, device)
+                if span is not None:
+                    span.set(confirmed=False, superseded=True)
+                return latency
+            self.confirm_latency.append(latency)
+            if span is not None:
+                span.set(confirmed=True)
+            return latency
+
+    def confirm_stats(self) -> dict[str, Any]:
+        """Return command-to-effect latency statistics."""
+        samples = sorted(self.confirm_latency)
+        if not samples:
+            return {"count": 0, "timeouts": self.confirm_timeouts}
+        return {
+            "count": len(samples),
+            "timeouts": self.confirm_timeouts,
+            "p50": round(samples[len(samples) // 2], 3),
+            "p95": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)], 3),
+            "max": round(samples[-1], 3),
+        }
+
+    async def set_devices(
+        self,
+        commands: list[tuple[str, dict]],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> list[dict[str, Any]]:
+        """Set H-codes on many devices with pipelined requests.
+
+        Commands are sent in windows of ``concurrency`` frames; each window
+        is paced by the rate limiter and then written without waiting for
+        the previous response.
+
+        Args:
+        ----
+            commands: A list of (device id, H-code map) pairs.
+            concurrency: The number of requests in flight at once.
+
+        Returns:
+        -------
+            A result with ``device``, ``success`` and ``error`` for each
+            command, in the order of the commands.
+
+        """
+        results: list[dict[str, Any]] = []
+        concurrency = max(concurrency, 1)
+        self._mark_active()
+
+        for start in range(0, len(commands), concurrency):
+            window = commands[start:start + concurrency]
+            await asyncio.gather(
+                *(self.rate_limiter.acquire(device) for device, _ in window)
+            )
+            msgs = {}
+            try:
+                async with self._scheduler.slot(PRIORITY_COMMAND):
+                    await self._async_connect()
+                    for device, data in window:
+                        self._ws_id = self._ws_id + 1
+                        msgs[self._ws_id] = (device, self._format_msg(
+                            self._ws_id, "set", device=device, data=data))
+                    responses = await self._ws_write_many(
+                        [msg for _, msg in msgs.values()])
+            except ExohomeError as err:
+                results.extend(
+                    {"device": device, "success": False, "error": str(err)}
+                    for device, _ in window
+                )
+                continue
+
+            for id, (device, _) in msgs.items():
+                response = responses.get(id)
+                if response is None:
+                    error = "timeout"
+                elif response.get("status") != "ok":
+                    error = str(response.get("status"))
+                else:
+                    error = None
+                    self._slow_tier_due.add(device)
+                results.append(
+                    {"device": device, "success": error is None, "error": error}
+                )
+
+        return results
 
     def get_login_info(self):
         """ Get info of login
@@ -391,6 +1257,8 @@ async def async_get_client_with_credentials(
     *,
     session: ClientSession | None = None,
     session_name: str | None = None,
+    api_base: str | None = None,
+    wss_base: str | None = None,
 ) -> Client:
     """Return an authenticated API object (using username/password).
 
@@ -400,13 +1268,20 @@ async def async_get_client_with_credentials(
         password: The account password.
         session: An optional aiohttp ClientSession.
         session_name: An optional session name to use for authentication.
+        api_base: An optional REST base URL instead of API_BASE.
+        wss_base: An optional websocket base URL instead of WSS_BASE.
 
     Returns:
     -------
         An authenticated Client object.
 
     """
-    client = Client(session=session, session_name=session_name)
+    client = Client(
+        session=session,
+        session_name=session_name,
+        api_base=api_base,
+        wss_base=wss_base,
+    )
     await client.async_authenticate_from_credentials(email, password)
     return client
 
@@ -418,6 +1293,8 @@ async def async_get_client_with_token(
     *,
     session: ClientSession | None = None,
     session_name: str | None = None,
+    api_base: str | None = None,
+    wss_base: str | None = None,
 ) -> Client:
     """Return an authenticated API object (using username/password).
 
@@ -427,12 +1304,19 @@ async def async_get_client_with_token(
         password: The account password.
         session: An optional aiohttp ClientSession.
         session_name: An optional session name to use for authentication.
+        api_base: An optional REST base URL instead of API_BASE.
+        wss_base: An optional websocket base URL instead of WSS_BASE.
 
     Returns:
     -------
         An authenticated Client object.
 
     """
-    client = Client(session=session, session_name=session_name)
+    client = Client(
+        session=session,
+        session_name=session_name,
+        api_base=api_base,
+        wss_base=wss_base,
+    )
     await client.async_set_token(email, password, token, expires_at)
     return client
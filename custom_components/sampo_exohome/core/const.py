@@ -100,3 +100,31 @@ AIRPURIFIER_PICOPURE_PRESET = "Picopure"
 AIRPURIFIER_PRESET_MODES = {
     AIRPURIFIER_PICOPURE: AIRPURIFIER_PICOPURE_PRESET,
 }
+
+POLL_TIER_FAST = "fast"
+POLL_TIER_SLOW = "slow"
+
+# Fields no entity writes rarely change, so they are refreshed every few polls
+# or right after a write. Anything an entity can change, which a remote can
+# change as well, stays in the fast tier with telemetry such as power,
+# current, temperatures and PM2.5, and is refreshed on every poll.
+CLIMATE_SLOW_FIELDS = {
+    CLIMATE_LIMITED_POWER,
+    CLIMATE_CONTROLLER_MODE,
+    CLIMATE_RESERVED,
+}
+AIRPURIFIER_SLOW_FIELDS = {
+    AIRPURIFIER_UNKNOWN1,
+    AIRPURIFIER_UNKNOWN2,
+}
+SLOW_FIELDS = {
+    DEVICE_TYPE_CLIMATE: CLIMATE_SLOW_FIELDS,
+    DEVICE_TYPE_AIRPURIFIER: AIRPURIFIER_SLOW_FIELDS,
+}
+
+
+def field_poll_tier(device_type: int, field: str) -> str:
+    """Return the polling tier of an H-code for a device type."""
+    if field in SLOW_FIELDS.get(device_type, ()):
+        return POLL_TIER_SLOW
+    return POLL_TIER_FAST
@@ -0,0 +1,138 @@
+"""Define websocket frame decoding that keeps the event loop responsive."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from typing import Any
+
+DEFAULT_SLICE = 0.005
+
+# Strings, and the brackets outside of them, tracked to find the top-level key.
+_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+_ARRAY_VALUE = re.compile(r"\s*:\s*\[")
+_WHITESPACE = re.compile(r"\s*")
+_SCAN_CHECK_EVERY = 1024
+
+
+def normalize_frame(frame: Any) -> Any:
+    """Drop device list entries without an id and give each one properties."""
+    if (
+        isinstance(frame, dict)
+        and frame.get("response") == "lst_device"
+        and isinstance(frame.get("data"), list)
+    ):
+        devices = []
+        for dev in frame["data"]:
+            if not isinstance(dev, dict) or dev.get("device") is None:
+                continue
+            if not isinstance(dev.get("properties"), dict):
+                dev["properties"] = {}
+            devices.append(dev)
+        frame["data"] = devices
+    return frame
+
+
+async def _async_find_data_array(
+    text: str, slice_time: float
+) -> tuple[tuple[int, int] | None, float]:
+    """Locate the array of the top-level ``data`` key.
+
+    Only a ``"data"`` key directly inside the outer object counts; keys of
+    nested objects and text inside strings are skipped.
+
+    Returns:
+    -------
+        The start of the key and the index just past its ``[``, or None if
+        the top-level ``data`` is missing or not an array, and the longest
+        time the loop was blocked, in seconds.
+
+    """
+    depth = 0
+    longest = 0.0
+    slice_start = time.perf_counter()
+    for count, token in enumerate(_TOKENS.finditer(text), 1):
+        kind = token.group()
+        if kind == "{" or kind == "[":
+            depth += 1
+        elif kind == "}" or kind == "]":
+            depth -= 1
+        elif depth == 1 and kind == '"data"':
+            value = _ARRAY_VALUE.match(text, token.end())
+            found = (token.start(), value.end()) if value else None
+            return found, max(longest, time.perf_counter() - slice_start)
+        if count % _SCAN_CHECK_EVERY == 0:
+            elapsed = time.perf_counter() - slice_start
+            if elapsed >= slice_time:
+                longest = max(longest, elapsed)
+                await asyncio.sleep(0)
+                slice_start = time.perf_counter()
+    return None, max(longest, time.perf_counter() - slice_start)
+
+
+def decode_frame(text: str | bytes) -> Any:
+    """Decode a websocket frame in one go."""
+    return normalize_frame(json.loads(text))
+
+
+async def async_decode_frame(
+    text: str | bytes, *, slice_time: float = DEFAULT_SLICE
+) -> tuple[Any, float]:
+    """Decode a large frame a list element at a time.
+
+    The elements of the top-level ``data`` array are decoded one by one and
+    control goes back to the event loop every ``slice_time`` seconds. An
+    executor would not help here: the JSON decoder holds the GIL, so the
+    loop would stall for the whole decode anyway.
+
+    Returns:
+    -------
+        The frame and the longest time the loop was blocked, in seconds.
+
+    Raises:
+    ------
+        ValueError: Raised when the frame is not valid JSON.
+
+    """
+    if isinstance(text, bytes):
+        text = text.decode()
+    found, longest = await _async_find_data_array(text, slice_time)
+    if found is None:
+        start = time.perf_counter()
+        frame = decode_frame(text)
+        return frame, max(longest, time.perf_counter() - start)
+
+    key_start, index = found
+    decoder = json.JSONDecoder()
+    items = []
+    slice_start = time.perf_counter()
+    try:
+        index = _WHITESPACE.match(text, index).end()
+        more = text[index] != "]"
+        while more:
+            index = _WHITESPACE.match(text, index).end()
+            item, index = decoder.raw_decode(text, index)
+            items.append(item)
+            index = _WHITESPACE.match(text, index).end()
+            # Exactly one comma between items, as json.loads requires.
+            more = text[index] == ","
+            if more:
+                index += 1
+            elif text[index] != "]":
+                msg = f"Expecting ',' delimiter at {index}"
+                raise ValueError(msg)
+            elapsed = time.perf_counter() - slice_start
+            if elapsed >= slice_time:
+                longest = max(longest, elapsed)
+                await asyncio.sleep(0)
+                slice_start = time.perf_counter()
+    except IndexError as err:
+        msg = "Unterminated data array"
+        raise ValueError(msg) from err
+
+    frame = json.loads(f'{text[:key_start]}"data":[]{text[index + 1:]}')
+    frame["data"] = items
+    frame = normalize_frame(frame)
+    return frame, max(longest, time.perf_counter() - slice_start)
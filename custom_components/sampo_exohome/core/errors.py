@@ -10,4 +10,8 @@ class RequestError(ExohomeError):
 
 
 class InvalidCredentialsError(ExohomeError):
-    """Define an error for unauthenticated accounts."""
\ No newline at end of file
+    """Define an error for unauthenticated accounts."""
+
+
+class RequestDeferredError(ExohomeError):
+    """Define an error for background requests dropped by the scheduler."""
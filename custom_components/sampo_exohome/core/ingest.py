@@ -0,0 +1,135 @@
+"""Define a bounded, coalescing queue for pushed device status."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import time
+from typing import Any
+
+DEFAULT_MAX_PENDING = 4096
+DEFAULT_TICK = 0.1
+
+
+class PushIngest:
+    """Define the queue between the websocket reader and the device cache.
+
+    Pushed values are keyed on (device, H-code), so a burst of frames for the
+    same field keeps only the latest value and memory is bounded by the
+    number of distinct fields. Once per tick the queue is applied in one
+    batch, one merge per device, and listeners are told which devices
+    changed.
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[str, dict], None],
+        *,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        tick: float = DEFAULT_TICK,
+        resync: Callable[[str], None] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            apply: Called with a device id and its merged status.
+            max_pending: The number of (device, H-code) values held at most.
+            tick: Seconds between batches.
+            resync: Called with a device id whose values had to be dropped.
+
+        """
+        self._apply = apply
+        self._max_pending = max(max_pending, 1)
+        self._tick = tick
+        self._resync = resync
+        self._pending: dict[tuple[str, str], Any] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._listeners: list[Callable[[set[str]], None]] = []
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.flush_max = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of values waiting to be applied."""
+        return len(self._pending)
+
+    def add_listener(self, listener: Callable[[set[str]], None]) -> Callable[[], None]:
+        """Register a callback run after each batch with the changed devices.
+
+        Returns:
+        -------
+            A callback that removes the listener.
+
+        """
+        self._listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    def put(self, device: str, status: dict) -> None:
+        """Queue the values of a pushed status report."""
+        for key, value in status.items():
+            self.received += 1
+            entry = (device, key)
+            if entry in self._pending:
+                self.coalesced += 1
+            elif len(self._pending) >= self._max_pending:
+                # Drop the oldest value; its device gets re-read instead.
+                oldest = next(iter(self._pending))
+                del self._pending[oldest]
+                self.dropped += 1
+                if self._resync is not None:
+                    self._resync(oldest[0])
+            self._pending[entry] = value
+        self.max_depth = max(self.max_depth, len(self._pending))
+        if self._pending and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._tick, self.flush
+            )
+
+    def flush(self) -> None:
+        """Apply the queued values now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        start = time.perf_counter()
+        batch, self._pending = self._pending, {}
+        merged: dict[str, dict] = {}
+        for (device, key), value in batch.items():
+            merged.setdefault(device, {})[key] = value
+        for device, status in merged.items():
+            self._apply(device, status)
+        changed = set(merged)
+        for listener in list(self._listeners):
+            listener(changed)
+        self.batches += 1
+        self.flush_max = max(self.flush_max, time.perf_counter() - start)
+
+    def clear(self) -> None:
+        """Drop the queued values and stop the timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = {}
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue statistics."""
+        return {
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "flush_max": round(self.flush_max, 4),
+        }
@@ -0,0 +1,196 @@
+"""Define on-demand profiling of the integration's work on the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Coroutine, Generator, Iterator
+from contextlib import contextmanager
+import cProfile
+from pathlib import Path
+import pstats
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+TOP_FUNCTIONS = 20
+
+
+class _Profiled(Awaitable[_T]):
+    """Define an awaitable running a coroutine profiled, one step at a time.
+
+    The profile is only enabled while the coroutine itself runs, not while
+    it waits, so other work on the event loop stays out of it.
+    """
+
+    def __init__(self, profiler: Profiler, coro: Coroutine[Any, Any, _T]) -> None:
+        """Initialize."""
+        self._profiler = profiler
+        self._coro = coro
+
+    def __await__(self) -> Generator[Any, None, _T]:
+        coro = self._coro
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            entered = self._profiler._enter()
+            try:
+                if error is None:
+                    future = coro.send(value)
+                else:
+                    future = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._profiler._exit(entered)
+            try:
+                value, error = (yield future), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as err:  # noqa: BLE001 - handed to the coroutine
+                value, error = None, err
+
+
+class Profiler:
+    """Define a deterministic profiler of the integration's hot path.
+
+    While a profile runs, refreshes, frame decoding and the entity state
+    writes that follow them are profiled with cProfile; the rest of the
+    event loop is not. When no profile runs, ``wrap`` hands coroutines
+    back untouched and ``section`` only checks an attribute.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._profile: cProfile.Profile | None = None
+        self._running = False
+        self._cycle_waiters: list[tuple[int, asyncio.Future]] = []
+        self.cycles = 0
+        # Steps left out because another profiler owned the thread.
+        self.skipped = 0
+
+    @property
+    def active(self) -> bool:
+        """Return whether a profile is running."""
+        return self._profile is not None
+
+    def start(self) -> None:
+        """Start a profile."""
+        self._profile = cProfile.Profile()
+        self.cycles = 0
+        self.skipped = 0
+
+    def stop(self) -> cProfile.Profile | None:
+        """Stop the running profile and return it."""
+        profile, self._profile = self._profile, None
+        if profile is not None and self._running:
+            profile.disable()
+            self._running = False
+        for _, waiter in self._cycle_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._cycle_waiters.clear()
+        return profile
+
+    def _enter(self) -> bool:
+        """Enable the profile unless it is off or already enabled."""
+        if self._profile is None or self._running:
+            return False
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Python 3.12+ allows a single profiler per thread.
+            self.skipped += 1
+            return False
+        self._running = True
+        return True
+
+    def _exit(self, entered: bool) -> None:
+        """Disable the profile if the matching ``_enter`` enabled it."""
+        if entered and self._running:
+            if self._profile is not None:
+                self._profile.disable()
+            self._running = False
+
+    def wrap(self, coro: Coroutine[Any, Any, _T]) -> Awaitable[_T]:
+        """Return a coroutine, profiled while a profile runs."""
+        if self._profile is None:
+            return coro
+        return _Profiled(self, coro)
+
+    @contextmanager
+    def section(self) -> Iterator[None]:
+        """Profile a synchronous block while a profile runs."""
+        entered = self._enter()
+        try:
+            yield
+        finally:
+            self._exit(entered)
+
+    def cycle_done(self) -> None:
+        """Count a finished refresh of any coordinator."""
+        if self._profile is None:
+            return
+        self.cycles += 1
+        for cycles, waiter in self._cycle_waiters:
+            if self.cycles >= cycles and not waiter.done():
+                waiter.set_result(None)
+
+    async def async_wait_cycles(self, cycles: int) -> None:
+        """Wait until a number of refreshes finished or the profile stopped."""
+        if self._profile is None or self.cycles >= cycles:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._cycle_waiters.append((cycles, waiter))
+        try:
+            await waiter
+        finally:
+            self._cycle_waiters = [
+                entry for entry in self._cycle_waiters if entry[1] is not waiter
+            ]
+
+
+def write_profile(
+    profile: cProfile.Profile, path: str | Path, top: int = TOP_FUNCTIONS
+) -> dict[str, Any]:
+    """Write a profile as a pstats file and return a summary of it.
+
+    This does blocking I/O; run it in the executor. An empty profile is
+    not written.
+
+    Returns:
+    -------
+        The file written, the totals and the functions with the most
+        cumulative time.
+
+    """
+    if not profile.getstats():
+        # Nothing ran while profiling; pstats refuses an empty profile.
+        return {"path": None, "calls": 0, "total_time": 0.0, "top": []}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats = pstats.Stats(profile)
+    stats.dump_stats(path)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    functions = []
+    for func in stats.fcn_list[:top]:
+        primitive, calls, tottime, cumtime, _ = stats.stats[func]
+        functions.append(
+            {
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "primitive_calls": primitive,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+        )
+    return {
+        "path": str(path),
+        "calls": stats.total_calls,
+        "total_time": round(stats.total_tt, 6),
+        "top": functions,
+    }
+
+
+# cProfile profiles a whole thread, so one profiler serves every entry.
+PROFILER = Profiler()
@@ -0,0 +1,142 @@
+"""Define a token-bucket rate limiter for device commands."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+DEFAULT_ACCOUNT_RATE = 5.0
+DEFAULT_ACCOUNT_BURST = 10
+DEFAULT_DEVICE_RATE = 1.0
+DEFAULT_DEVICE_BURST = 3
+
+
+class TokenBucket:
+    """Define a token bucket that hands out reservations."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            rate: Tokens added per second; zero disables the bucket.
+            burst: The bucket capacity.
+
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds until it may be used.
+
+        Reservations are granted in call order, so callers that sleep for
+        the returned delay are served first-in, first-out.
+        """
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Define per-account and per-device pacing of commands.
+
+    Callers are queued rather than rejected: ``acquire`` waits first for the
+    device bucket and then for the account bucket.
+    """
+
+    def __init__(
+        self,
+        *,
+        account_rate: float = DEFAULT_ACCOUNT_RATE,
+        account_burst: int = DEFAULT_ACCOUNT_BURST,
+        device_rate: float = DEFAULT_DEVICE_RATE,
+        device_burst: int = DEFAULT_DEVICE_BURST,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            account_rate: Commands per second allowed for the account.
+            account_burst: Commands the account may send back to back.
+            device_rate: Commands per second allowed for each device.
+            device_burst: Commands each device may receive back to back.
+
+        """
+        self._account = TokenBucket(account_rate, account_burst)
+        self._device_rate = device_rate
+        self._device_burst = device_burst
+        self._devices: dict[str, TokenBucket] = {}
+        self._queued = 0
+        self._acquired = 0
+        self._delayed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting for a token."""
+        return self._queued
+
+    def _device_bucket(self, device: str) -> TokenBucket:
+        """Return the bucket of a device."""
+        bucket = self._devices.get(device)
+        if bucket is None:
+            bucket = TokenBucket(self._device_rate, self._device_burst)
+            self._devices[device] = bucket
+        return bucket
+
+    async def acquire(self, device: str | None = None) -> float:
+        """Wait until a command may be sent.
+
+        Args:
+        ----
+            device: An optional device id.
+
+        Returns:
+        -------
+            The seconds spent waiting.
+
+        """
+        start = time.monotonic()
+        self._queued += 1
+        try:
+            if device is not None:
+                delay = self._device_bucket(device).reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+            delay = self._account.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            self._queued -= 1
+
+        waited = time.monotonic() - start
+        self._acquired += 1
+        if waited > 0.001:
+            self._delayed += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return waited
+
+    def stats(self) -> dict[str, float]:
+        """Return queue depth and wait time statistics."""
+        return {
+            "queue_depth": self._queued,
+            "acquired": self._acquired,
+            "delayed": self._delayed,
+            "wait_total": round(self._wait_total, 3),
+            "wait_max": round(self._wait_max, 3),
+            "wait_avg": round(self._wait_total / self._acquired, 3)
+            if self._acquired
+            else 0.0,
+        }
@@ -0,0 +1,155 @@
+"""Define a desired-state reconciler for device commands."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from .client import normalize_value
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from .client import Client
+
+DEFAULT_DEBOUNCE = 0.3
+
+
+class DeviceReconciler:
+    """Define the desired state of one device.
+
+    Writes are collected for a short debounce window and sent as a single
+    ``set``. A newer value for an H-code replaces a pending one, and values
+    that already match the confirmed status are never sent. A flush
+    completes once the device reports the new values.
+    """
+
+    def __init__(
+        self, client: Client, device: str, *, debounce: float = DEFAULT_DEBOUNCE
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            client: The exohome client
+            device: The device id.
+            debounce: Seconds to wait for further writes before flushing.
+
+        """
+        self._client = client
+        self._device = device
+        self._debounce = debounce
+        self._pending: dict[str, Any] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> dict[str, Any]:
+        """Return the values waiting to be sent."""
+        return dict(self._pending)
+
+    def _confirmed(self) -> dict:
+        """Return the last status reported by the device."""
+        info = self._client.devices.get(self._device, {})
+        return info.get("properties", {}).get("status", {})
+
+    def _matches_confirmed(self, key: str, value: Any) -> bool:
+        """Return whether a value is already the confirmed state."""
+        confirmed = self._confirmed()
+        return key in confirmed and (
+            normalize_value(confirmed[key]) == normalize_value(value)
+        )
+
+    async def async_set(self, data: dict[str, Any]) -> bool:
+        """Merge desired values and wait until they have been applied.
+
+        Returns:
+        -------
+            Whether the device confirmed the desired state.
+
+        Raises:
+        ------
+            ExohomeError: Raised when the flush fails.
+
+        """
+        for key, value in data.items():
+            if key not in self._pending and self._matches_confirmed(key, value):
+                continue
+            self._pending[key] = value
+
+        if not self._pending:
+            return True
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._waiters.append(fut)
+        if self._timer is None:
+            self._timer = loop.call_later(self._debounce, self._start_flush)
+        return await fut
+
+    def _start_flush(self) -> None:
+        """Start a flush, keeping a reference so it is not collected."""
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self._async_flush())
+        self._flush_task = task
+
+        def _done(_: asyncio.Task) -> None:
+            if self._flush_task is task:
+                self._flush_task = None
+
+        task.add_done_callback(_done)
+
+    async def async_shutdown(self) -> None:
+        """Drop pending writes and cancel a flush in flight.
+
+        Callers still waiting for a write see it cancelled.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        waiters, self._waiters = self._waiters, []
+        self._pending = {}
+        for fut in waiters:
+            if not fut.done():
+                fut.cancel()
+
+    async def _async_flush(self) -> None:
+        """Send the pending values in one request."""
+        data = {
+            key: value
+            for key, value in self._pending.items()
+            if not self._matches_confirmed(key, value)
+        }
+        waiters, self._waiters = self._waiters, []
+        self._pending = {}
+
+        error: Exception | None = None
+        confirmed = True
+        if data:
+            try:
+                latency = await self._client.set_and_confirm(self._device, data)
+            except asyncio.CancelledError:
+                for fut in waiters:
+                    fut.cancel()
+                raise
+            except Exception as err:  # noqa: BLE001
+                error = err
+            else:
+                confirmed = latency is not None
+        else:
+            LOGGER.debug("Dropped no-op write to %s", self._device)
+
+        for fut in waiters:
+            if fut.done():
+                continue
+            if error:
+                fut.set_exception(error)
+            else:
+                fut.set_result(confirmed)
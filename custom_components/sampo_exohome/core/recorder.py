@@ -0,0 +1,391 @@
+"""Define capture and replay of websocket sessions."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import UTC, datetime
+import json
+from pathlib import Path
+import re
+import time
+from typing import Any
+
+DIRECTION_IN = "i"
+DIRECTION_OUT = "o"
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+DEFAULT_MAX_PENDING = 10000
+FORMAT = "exohome-frames"
+FORMAT_VERSION = 1
+
+REDACTED = "**REDACTED**"
+REDACT_KEYS = ("token", "password", "email", "phone", "name", "access_token")
+
+_SECRETS = re.compile(
+    r'"(%s)"\s*:\s*"(?:[^"\\]|\\.)*"' % "|".join(REDACT_KEYS)
+)
+
+
+def redact_frame(text: str) -> str:
+    """Replace the string values of secret keys in a JSON frame."""
+    return _SECRETS.sub(rf'"\1":"{REDACTED}"', text)
+
+
+class JsonLinesWriter:
+    """Define a buffered writer of lines to a rotating file.
+
+    Lines are written from the executor so the event loop never waits on
+    the disk; if the disk cannot keep up, lines beyond ``max_pending`` are
+    dropped and counted.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        header: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            path: The file to write; rotated files get ``.1``, ``.2``, ...
+            max_bytes: The size at which the file is rotated.
+            backups: The number of rotated files kept.
+            max_pending: The number of lines buffered at most.
+            header: An optional object written as the first line of each file.
+
+        """
+        self.path = Path(path)
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._max_pending = max_pending
+        self._header = header
+        self._pending: list[str] = []
+        self._flushing: asyncio.Task | None = None
+        self._size: int | None = None
+        self.lines = 0
+        self.dropped = 0
+
+    def write(self, line: str) -> None:
+        """Buffer one line and make sure a flush is on its way."""
+        if len(self._pending) >= self._max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(line + "\n")
+        self.lines += 1
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.get_running_loop().create_task(
+                self._async_flush()
+            )
+
+    async def _async_flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            lines, self._pending = self._pending, []
+            await loop.run_in_executor(None, self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the file, rotating it when it is full."""
+        if self._size is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._size = self.path.stat().st_size if self.path.exists() else 0
+        if self._size >= self._max_bytes:
+            self._rotate()
+        with self.path.open("a", encoding="utf-8") as file:
+            if self._size == 0 and self._header is not None:
+                header = {**self._header, "started": datetime.now(UTC).isoformat()}
+                self._size += file.write(json.dumps(header) + "\n")
+            for line in lines:
+                self._size += file.write(line)
+
+    def _rotate(self) -> None:
+        for index in range(self._backups, 0, -1):
+            source = self.path.with_name(
+                f"{self.path.name}.{index - 1}" if index > 1 else self.path.name
+            )
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index}"))
+        if self._backups == 0:
+            self.path.unlink(missing_ok=True)
+        self._size = 0
+
+    async def async_close(self) -> None:
+        """Write out everything buffered so far."""
+        if self._flushing is not None:
+            await self._flushing
+
+
+class FrameRecorder:
+    """Define a recorder of websocket frames to a rotating JSON lines file.
+
+    Each line holds the seconds since recording started, the direction and
+    the frame itself, with secrets redacted.
+    """
+
+    def __init__(self, path: str | Path, **kwargs: Any) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            path: The file to write.
+            **kwargs: Passed on to JsonLinesWriter.
+
+        """
+        self.writer = JsonLinesWriter(
+            path, header={"format": FORMAT, "version": FORMAT_VERSION}, **kwargs
+        )
+        self._start = time.monotonic()
+
+    @property
+    def path(self) -> Path:
+        """Return the file being written."""
+        return self.writer.path
+
+    @property
+    def frames(self) -> int:
+        """Return the number of frames recorded."""
+        return self.writer.lines
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of frames dropped because the disk lagged."""
+        return self.writer.dropped
+
+    def record(self, direction: str, text: str | bytes) -> None:
+        """Record one frame."""
+        if isinstance(text, bytes):
+            text = text.decode(errors="replace")
+        stripped = text.strip()
+        if not stripped or stripped[0] + stripped[-1] not in ("{}", "[]"):
+            # Keep frames that are not JSON objects or arrays as strings.
+            text = json.dumps(text)
+        elapsed = time.monotonic() - self._start
+        self.writer.write(
+            f'{{"t":{elapsed:.6f},"d":"{direction}","f":{redact_frame(text)}}}'
+        )
+
+    async def async_close(self) -> None:
+        """Write out everything buffered so far."""
+        await self.writer.async_close()
+
+
+def load_recording(path: str | Path) -> list[tuple[float, str, Any]]:
+    """Return the frames of a recording and its rotated files, oldest first.
+
+    Returns:
+    -------
+        (seconds since recording started, direction, frame) tuples.
+
+    """
+    path = Path(path)
+    backups = sorted(
+        (
+            file
+            for file in path.parent.glob(f"{path.name}.*")
+            if file.suffix[1:].isdigit()
+        ),
+        key=lambda file: int(file.suffix[1:]),
+        reverse=True,
+    )
+    records = []
+    for file in [*backups, path]:
+        if not file.exists():
+            continue
+        for line in file.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if "format" in entry:
+                continue
+            records.append((entry["t"], entry["d"], entry["f"]))
+    records.sort(key=lambda record: record[0])
+    return records
+
+
+class ReplaySocket:
+    """Define a websocket stand-in fed by a replay."""
+
+    def __init__(self, replay: Replay) -> None:
+        """Initialize."""
+        self._replay = replay
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self._tasks: set[asyncio.Task] = set()
+        self.closed = False
+
+    async def send(self, text: str) -> None:
+        """Answer a request from the recording."""
+        if self.closed:
+            return
+        delay, seq, frame = self._replay.answer(json.loads(text))
+        task = asyncio.get_running_loop().create_task(
+            self._async_answer(delay, seq, frame)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_answer(self, delay: float, seq: int, frame: dict) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._replay.deliver_response(self, seq, frame)
+
+    def deliver(self, frame: Any) -> None:
+        """Hand a frame to the reader."""
+        if not self.closed:
+            self._queue.put_nowait(json.dumps(frame))
+
+    async def close(self) -> None:
+        """Stop delivering frames and end iteration."""
+        self.closed = True
+        for task in self._tasks:
+            task.cancel()
+        self._queue.put_nowait(None)
+
+    def __aiter__(self) -> ReplaySocket:
+        return self
+
+    async def __anext__(self) -> str:
+        text = await self._queue.get()
+        if text is None:
+            raise StopAsyncIteration
+        return text
+
+
+class Replay:
+    """Define a transport that answers a client from a recording.
+
+    Each request is answered with the next recorded response to the same
+    verb and device, after its recorded round trip time; the last one is
+    reused once they run out. Pushed frames follow their recorded schedule
+    but keep their place among the responses: a push never overtakes the
+    responses recorded before it, and is sent ahead of any response
+    recorded after it. ``speed`` divides every delay, so 10 replays ten
+    times faster. Given the same client behaviour, a replay produces the
+    same frames in the same order at any speed.
+    """
+
+    def __init__(
+        self, records: list[tuple[float, str, Any]], *, speed: float = 1.0
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            records: Frames as returned by ``load_recording``.
+            speed: How much faster than recorded to replay.
+
+        Raises:
+        ------
+            ValueError: Raised when speed is not positive.
+
+        """
+        if speed <= 0:
+            msg = "Replay speed must be positive"
+            raise ValueError(msg)
+        self._speed = speed
+        self._responses: dict[
+            tuple[str, str | None], deque[tuple[float, int, dict]]
+        ] = {}
+        # (recorded at, position, responses recorded before it, frame)
+        self._pushes: list[tuple[float, int, int, Any]] = []
+        self._next_push = 0
+        self._answered = 0
+        self._progress = asyncio.Event()
+        self._push_task: asyncio.Task | None = None
+        self._socket: ReplaySocket | None = None
+        self.unanswered = 0
+
+        sent: dict[int, tuple[float, str, str | None]] = {}
+        responses = 0
+        for seq, (at, direction, frame) in enumerate(records):
+            if not isinstance(frame, dict):
+                continue
+            if direction == DIRECTION_OUT:
+                sent[frame.get("id")] = (
+                    at,
+                    frame.get("request"),
+                    frame.get("device"),
+                )
+                continue
+            request = sent.pop(frame.get("id"), None) if "id" in frame else None
+            if request is None:
+                self._pushes.append((at, seq, responses, frame))
+                continue
+            sent_at, verb, device = request
+            self._responses.setdefault((verb, device), deque()).append(
+                (at - sent_at, seq, frame)
+            )
+            responses += 1
+        self._origin = records[0][0] if records else 0.0
+
+    @classmethod
+    def from_file(cls, path: str | Path, *, speed: float = 1.0) -> Replay:
+        """Return a replay of a recording on disk."""
+        return cls(load_recording(path), speed=speed)
+
+    async def connect(self, url: str, **kwargs: Any) -> ReplaySocket:
+        """Open a socket; takes the place of ``websockets.connect``."""
+        self._socket = ReplaySocket(self)
+        if self._push_task is None:
+            self._push_task = asyncio.get_running_loop().create_task(
+                self._async_push()
+            )
+        return self._socket
+
+    def answer(self, msg: dict) -> tuple[float, int, dict]:
+        """Return the delay, recorded position and frame answering a request."""
+        responses = self._responses.get((msg.get("request"), msg.get("device")))
+        if not responses:
+            # The login may have been rotated out of the recording.
+            status = "ok" if msg.get("request") == "login" else "not_recorded"
+            self.unanswered += status != "ok"
+            return 0.0, -1, {
+                "id": msg.get("id"),
+                "response": msg.get("request"),
+                "status": status,
+            }
+        rtt, seq, frame = responses.popleft() if len(responses) > 1 else responses[0]
+        return rtt / self._speed, seq, {**frame, "id": msg.get("id")}
+
+    def deliver_response(self, socket: ReplaySocket, seq: int, frame: dict) -> None:
+        """Send the pushes recorded before a response, then the response."""
+        while (
+            self._next_push < len(self._pushes)
+            and self._pushes[self._next_push][1] < seq
+        ):
+            socket.deliver(self._pushes[self._next_push][3])
+            self._next_push += 1
+        socket.deliver(frame)
+        self._answered += 1
+        self._progress.set()
+
+    async def _async_push(self) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while self._next_push < len(self._pushes):
+            at, _, before, frame = self._pushes[self._next_push]
+            delay = start + (at - self._origin) / self._speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            while self._answered < before:
+                self._progress.clear()
+                await self._progress.wait()
+            if self._next_push >= len(self._pushes):
+                return  # responses sent the remaining pushes meanwhile
+            if self._pushes[self._next_push][3] is not frame:
+                continue  # a response sent it in the meantime
+            if self._socket is not None:
+                self._socket.deliver(frame)
+            self._next_push += 1
+
+    async def async_close(self) -> None:
+        """Stop delivering pushed frames."""
+        if self._push_task is not None:
+            self._push_task.cancel()
+            self._push_task = None
@@ -0,0 +1,100 @@
+"""Define a priority scheduler for the shared websocket."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+
+from .errors import RequestDeferredError
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+DEFAULT_MAX_POLL_BACKLOG = 32
+
+
+class RequestScheduler:
+    """Define a priority-ordered gate in front of the websocket.
+
+    Only one request/response exchange owns the socket at a time. When the
+    socket is released, the waiter with the lowest priority value goes next,
+    so interactive commands overtake queued background polls.
+    """
+
+    def __init__(self, *, max_poll_backlog: int = DEFAULT_MAX_POLL_BACKLOG) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            max_poll_backlog: The number of queued background requests after
+                which new background requests are dropped.
+
+        """
+        self._busy = False
+        self._max_poll_backlog = max_poll_backlog
+        self._sequence = itertools.count()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+
+    @property
+    def busy(self) -> bool:
+        """Return whether a request currently owns the socket."""
+        return self._busy
+
+    def backlog(self, priority: int | None = None) -> int:
+        """Return the number of queued requests, optionally for one priority."""
+        return sum(
+            1
+            for prio, _, fut in self._waiters
+            if not fut.done() and (priority is None or prio == priority)
+        )
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_COMMAND) -> AsyncIterator[None]:
+        """Own the socket for one exchange.
+
+        Raises:
+        ------
+            RequestDeferredError: Raised when a background request is dropped
+                because the queue is too deep.
+
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait for our turn on the socket."""
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+
+        if (
+            priority >= PRIORITY_POLL
+            and self.backlog(PRIORITY_POLL) >= self._max_poll_backlog
+        ):
+            msg = "Background request dropped, request queue is full"
+            raise RequestDeferredError(msg)
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # We were handed the socket just as we got cancelled.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the socket to the next waiter, if any."""
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._busy = False
@@ -0,0 +1,205 @@
+"""Define span-style tracing of refresh and command cycles."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from itertools import count
+import json
+import time
+from typing import Any
+from uuid import uuid4
+
+from .recorder import JsonLinesWriter
+
+DEFAULT_MAX_TRACES = 50
+DEFAULT_MAX_SPANS = 2000
+
+_current: ContextVar[Span | None] = ContextVar("exohome_span", default=None)
+
+
+def _running_span() -> Span | None:
+    """Return the current span, unless its trace has already finished.
+
+    Tasks started during a trace, such as a debounced refresh, inherit its
+    context and may run after it ended.
+    """
+    span = _current.get()
+    if span is None or span.trace.root.end is not None:
+        return None
+    return span
+
+
+class Span:
+    """Define one timed step of a trace."""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "start",
+        "end",
+        "attributes",
+    )
+
+    def __init__(
+        self, trace: Trace, parent_id: int | None, name: str, attributes: dict
+    ) -> None:
+        """Initialize."""
+        self.trace = trace
+        self.span_id = next(trace.ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.monotonic()
+        self.end: float | None = None
+        self.attributes = attributes
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the span with times relative to the start of its trace."""
+        origin = self.trace.root.start
+        return {
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": round(self.start - origin, 6),
+            "duration": None if self.end is None else round(self.end - self.start, 6),
+            **({"attributes": self.attributes} if self.attributes else {}),
+        }
+
+
+class Trace:
+    """Define the spans of one refresh or command."""
+
+    def __init__(self, name: str, attributes: dict, max_spans: int) -> None:
+        """Initialize."""
+        self.trace_id = uuid4().hex[:16]
+        self.started = datetime.now(UTC)
+        self.ids = count(1)
+        self.max_spans = max_spans
+        self.dropped = 0
+        self.root = Span(self, None, name, attributes)
+        self.spans: list[Span] = [self.root]
+
+    @property
+    def duration(self) -> float | None:
+        """Return the duration of the root span."""
+        if self.root.end is None:
+            return None
+        return self.root.end - self.root.start
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace and all of its spans."""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "started": self.started.isoformat(),
+            "duration": None if self.duration is None else round(self.duration, 6),
+            "dropped_spans": self.dropped,
+            "spans": [span.as_dict() for span in self.spans],
+        }
+
+
+class Tracer:
+    """Define a tracer keeping the latest traces in a ring buffer.
+
+    The current span follows the asyncio context, so spans opened by the
+    client while a coordinator refresh or an entity command runs become
+    its children, including in tasks started from it. Outside of a trace
+    ``span`` is a no-op, and so is everything while ``enabled`` is off.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_traces: int = DEFAULT_MAX_TRACES,
+        max_spans: int = DEFAULT_MAX_SPANS,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            max_traces: The number of finished traces kept.
+            max_spans: The number of spans kept per trace.
+
+        """
+        self.traces: deque[Trace] = deque(maxlen=max_traces)
+        self._max_spans = max_spans
+        self.enabled = True
+        self.writer: JsonLinesWriter | None = None
+
+    def export_to(self, path: str, **kwargs: Any) -> None:
+        """Also write each finished trace as a line of JSON to a file.
+
+        Args:
+        ----
+            path: The file to write.
+            **kwargs: Passed on to JsonLinesWriter.
+
+        """
+        self.writer = JsonLinesWriter(path, **kwargs)
+
+    async def async_close(self) -> None:
+        """Stop exporting and write out the buffered traces."""
+        writer, self.writer = self.writer, None
+        if writer is not None:
+            await writer.async_close()
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Start a trace, or a child span when one is already running."""
+        if not self.enabled:
+            yield None
+            return
+        if _running_span() is not None:
+            with self.span(name, **attributes) as span:
+                yield span
+            return
+        trace = Trace(name, attributes, self._max_spans)
+        token = _current.set(trace.root)
+        try:
+            yield trace.root
+        except BaseException as err:
+            trace.root.set(error=repr(err))
+            raise
+        finally:
+            _current.reset(token)
+            trace.root.end = time.monotonic()
+            self.traces.append(trace)
+            if self.writer is not None:
+                self.writer.write(json.dumps(trace.as_dict(), default=str))
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Time a step of the running trace."""
+        parent = _running_span() if self.enabled else None
+        if parent is None:
+            yield None
+            return
+        trace = parent.trace
+        if len(trace.spans) >= trace.max_spans:
+            trace.dropped += 1
+            yield None
+            return
+        span = Span(trace, parent.span_id, name, attributes)
+        trace.spans.append(span)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.set(error=repr(err))
+            raise
+        finally:
+            _current.reset(token)
+            span.end = time.monotonic()
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the buffered traces, oldest first."""
+        return [trace.as_dict() for trace in self.traces]
@@ -1,43 +1,153 @@
-"""Diagnostics support for Notion."""
+"""Diagnostics support for Sampo Smart Home."""
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+import json
+import time
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL, CONF_UNIQUE_ID, CONF_USERNAME
+from homeassistant.const import (
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_UNIQUE_ID,
+    CONF_USERNAME,
+)
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, CONF_USER_ID
+from .core.client import Client
+from .core.recorder import redact_frame
 from .coordinator import ExohomeDataUpdateCoordinator
 
 CONF_DEVICE_KEY = "device_key"
+CONF_DISPLAY_NAME = "displayName"
 CONF_HARDWARE_ID = "hardware_id"
+CONF_LOCAL_IP = "local_ip"
+CONF_MAC = "mac"
 CONF_TITLE = "title"
+CONF_TOKEN = "token"
+
+# Lists in frames are cut to this many entries and strings to this length.
+MAX_FRAME_ITEMS = 5
+MAX_FRAME_STRING = 1024
+
+ERROR_COUNTERS = ("connect_failures", "reconnects", "retries", "timeouts")
 
 TO_REDACT = {
     CONF_DEVICE_KEY,
+    CONF_DISPLAY_NAME,
     CONF_EMAIL,
     CONF_HARDWARE_ID,
+    CONF_LOCAL_IP,
+    CONF_MAC,
+    CONF_PASSWORD,
     # Config entry title and unique ID may contain sensitive data:
     CONF_TITLE,
+    CONF_TOKEN,
     CONF_UNIQUE_ID,
     CONF_USERNAME,
     CONF_USER_ID,
 }
 
 
+def _age(since: float | None, now: float) -> float | None:
+    """Return the seconds elapsed since a monotonic time."""
+    return None if since is None else round(now - since, 1)
+
+
+def _devices(coordinator: ExohomeDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the freshness, latency and breaker of each listed device."""
+    client = coordinator.get_client()
+    now = time.monotonic()
+    devices = {}
+    for device in coordinator.data or {}:
+        latency = client.fetch_latency.get(device)
+        info: dict[str, Any] = {
+            "available": coordinator.is_device_available(device),
+            "last_update_age": _age(client.last_update.get(device), now),
+            "fetch_latency": None if latency is None else round(latency, 6),
+            "polled_elsewhere": device in client.polled_elsewhere,
+            "breaker": client.device_breaker(device).as_dict(),
+        }
+        if (device_coordinator := coordinator.device_coordinators.get(device)):
+            info["last_update_success"] = device_coordinator.last_update_success
+        devices[device] = info
+    return devices
+
+
+def _shorten(value: Any) -> Any:
+    """Return a frame with long lists and strings cut short."""
+    if isinstance(value, dict):
+        return {key: _shorten(item) for key, item in value.items()}
+    if isinstance(value, list):
+        kept = [_shorten(item) for item in value[:MAX_FRAME_ITEMS]]
+        if len(value) > MAX_FRAME_ITEMS:
+            kept.append(f"... {len(value) - MAX_FRAME_ITEMS} more")
+        return kept
+    if isinstance(value, str) and len(value) > MAX_FRAME_STRING:
+        return f"{value[:MAX_FRAME_STRING]}... ({len(value)} characters)"
+    return value
+
+
+def _frames(client: Client) -> list[dict[str, Any]]:
+    """Return the latest websocket frames, oldest first, with secrets redacted.
+
+    Frames are redacted in full before they are shortened, so nothing
+    sensitive survives in a part that is cut.
+    """
+    frames = []
+    for at, direction, text in client.frame_history:
+        if isinstance(text, bytes):
+            text = text.decode(errors="replace")
+        text = redact_frame(text)
+        frame: Any
+        try:
+            frame = async_redact_data(json.loads(text), TO_REDACT)
+        except ValueError:
+            frame = text
+        frames.append(
+            {
+                "time": datetime.fromtimestamp(at, UTC).isoformat(),
+                "direction": direction,
+                "frame": _shorten(frame),
+            }
+        )
+    return frames
+
+
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     coordinator: ExohomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.get_client()
 
     return async_redact_data(
         {
             "entry": entry.as_dict(),
-            "data": coordinator.data.asdict(),
+            "connection": {
+                **client.connection_state(),
+                "last_update_success": coordinator.last_update_success,
+                "last_exception": repr(coordinator.last_exception)
+                if coordinator.last_exception
+                else None,
+                "breaker": coordinator.breaker.as_dict(),
+            },
+            "errors": {
+                **{name: client.metrics.counter(name) for name in ERROR_COUNTERS},
+                "confirm_timeouts": client.confirm_timeouts,
+            },
+            "data": dict(coordinator.data or {}),
+            "devices": _devices(coordinator),
+            "decode": dict(client.decode_stats),
+            "confirm": client.confirm_stats(),
+            "metrics": client.metrics.as_dict(),
+            "frames": _frames(client),
+            "traces": client.tracer.as_list(),
+            "benchmark": client.benchmark,
         },
         TO_REDACT,
     )
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 
 from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -24,6 +24,8 @@ class ExohomeEntity(CoordinatorEntity[ExohomeDataUpdateCoordinator]):
     """Define a base Exohome entity."""
 
     _attr_has_entity_name = True
+    # The H-codes read by an entity without an entity description.
+    _read_fields: frozenset[str] | None = None
 
     def __init__(
         self,
@@ -32,6 +34,7 @@ class ExohomeEntity(CoordinatorEntity[ExohomeDataUpdateCoordinator]):
         info: dict,
     ) -> None:
         """Initialize the entity."""
+        coordinator = coordinator.coordinator_for(device)
         super().__init__(coordinator)
         self.device = device
         self.info = info
@@ -39,6 +42,41 @@ class ExohomeEntity(CoordinatorEntity[ExohomeDataUpdateCoordinator]):
         self.client = coordinator.get_client()
 
         self._device_id = int(self.info["properties"]["profile"]["esh"]["device_id"])
+        self._tracked: tuple[str, ...] = ()
+        self._last_state: tuple | None = None
+
+    @property
+    def tracked_fields(self) -> set[str]:
+        """Return the H-codes this entity reads."""
+        description = getattr(self, "entity_description", None)
+        if description is not None:
+            return {description.key}
+        if self._read_fields is not None:
+            return set(self._read_fields)
+        return set(self.fields)
+
+    async def async_added_to_hass(self) -> None:
+        """Register the fields of this entity with the coordinator."""
+        await super().async_added_to_hass()
+        self._tracked = tuple(sorted(self.tracked_fields))
+        self.async_on_remove(
+            self.coordinator.async_track_fields(self.device, set(self._tracked))
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when a tracked field or availability changed."""
+        info = (self.coordinator.data or {}).get(self.device, {})
+        status = info.get("properties", {}).get("status", {})
+        state = (self.available, tuple(status.get(key) for key in self._tracked))
+        if state == self._last_state:
+            return
+        self._last_state = state
+        super()._handle_coordinator_update()
+
+    async def async_set_device(self, data: dict) -> None:
+        """Set H-code values of this device."""
+        await self.coordinator.async_set_device(self.device, data)
 
     @property
     def nickname(self) -> str:
@@ -77,7 +115,7 @@ class ExohomeEntity(CoordinatorEntity[ExohomeDataUpdateCoordinator]):
 
     @property
     def available(self) -> bool:
-        return bool(self.info["properties"]["connected"])
+        return super().available and self.coordinator.is_device_available(self.device)
 
     @property
     def status(self) -> dict:
@@ -96,3 +134,31 @@ class ExohomeEntity(CoordinatorEntity[ExohomeDataUpdateCoordinator]):
         return self.info["properties"].get("fields_range", {})
 
 
+class ExohomeHubEntity(CoordinatorEntity[ExohomeDataUpdateCoordinator]):
+    """Define an entity of the account hub device."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: ExohomeDataUpdateCoordinator,
+        description: EntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        entry = coordinator.config_entry
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Sampo",
+            model="Home Plus Cloud",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Stay available to report on failed updates."""
+        return True
+
@@ -1,5 +1,4 @@
 """Support for Exohome Fan."""
-import asyncio
 from typing import Any
 
 from homeassistant.components.fan import (
@@ -65,6 +64,15 @@ async def async_setup_entry(hass, entry, async_add_entities) -> bool:
 class ExohomeFan(ExohomeEntity, FanEntity):
     """Define a Exohome Fan."""
 
+    _read_fields = frozenset({
+        AIRPURIFIER_OPERATING_MODE,
+        AIRPURIFIER_PICOPURE,
+        FAN_OPERATING_MODE,
+        FAN_OSCILLATE,
+        FAN_POWER,
+        FAN_SPEED,
+    })
+
     def __init__(
         self,
         coordinator,
@@ -143,15 +151,11 @@ class ExohomeFan(ExohomeEntity, FanEntity):
             # If operation mode was set the device must not be turned on.
             await self.async_set_preset_mode(preset_mode)
         else:
-            await self.client.set_device(self.device, FAN_POWER, 1)
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
+            await self.async_set_device({FAN_POWER: 1})
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the device off."""
-        await self.client.set_device(self.device, FAN_POWER, 0)
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({FAN_POWER: 0})
 
     @property
     def preset_modes(self) -> list[str] | None:
@@ -185,24 +189,22 @@ class ExohomeFan(ExohomeEntity, FanEntity):
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
         if self._device_id == DEVICE_TYPE_FAN:
-            await self.client.set_device(
-                self.device, FAN_OPERATING_MODE, FAN_PRESET_MODES[preset_mode])
+            await self.async_set_device(
+                {FAN_OPERATING_MODE: FAN_PRESET_MODES[preset_mode]})
         if self._device_id == DEVICE_TYPE_AIRPURIFIER:
-            await self.client.set_device(
-                self.device, FAN_OPERATING_MODE, AIRPURIFIER_PRESET_MODES[preset_mode])
-        await self.coordinator.async_request_refresh()
+            await self.async_set_device(
+                {FAN_OPERATING_MODE: AIRPURIFIER_PRESET_MODES[preset_mode]})
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
         if percentage == 0:
-            await self.client.set_device(self.device, FAN_POWER, 0)
+            await self.async_set_device({FAN_POWER: 0})
         else:
             if self._device_id == DEVICE_TYPE_FAN:
-                await self.client.set_device(self.device, FAN_SPEED, percentage)
+                await self.async_set_device({FAN_SPEED: percentage})
             if self._device_id == DEVICE_TYPE_AIRPURIFIER:
-                await self.client.set_device(
-                    self.device, AIRPURIFIER_OPERATING_MODE, percentage / self.percentage_step)
-        await self.coordinator.async_request_refresh()
+                await self.async_set_device(
+                    {AIRPURIFIER_OPERATING_MODE: percentage / self.percentage_step})
 
     @property
     def oscillating(self) -> bool | None:
@@ -217,5 +219,4 @@ class ExohomeFan(ExohomeEntity, FanEntity):
     async def async_oscillate(self, oscillating: bool) -> None:
         """Set oscillation."""
         if self._device_id == DEVICE_TYPE_FAN:
-            await self.client.set_device(self.device, FAN_OSCILLATE, oscillating)
-        await self.coordinator.async_request_refresh()
+            await self.async_set_device({FAN_OSCILLATE: oscillating})
@@ -48,6 +48,7 @@ AIRPURIFIER_SELECTS: tuple[ExohomeSelectDescription, ...] = (
         key=AIRPURIFIER_RESERVED,
         name="Reserved",
         entity_category=EntityCategory.CONFIG,
+        entity_registry_enabled_default=False,
         icon='mdi:help',
         options=[],
         options_value=[]
@@ -193,6 +194,4 @@ class ExohomeSelect(ExohomeEntity, SelectEntity):
             index  = self.entity_description.options.index(option)
             value = self.entity_description.options_value[index]
 
-        await self.client.set_device(
-            self.device, self.entity_description.key, int(value))
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({self.entity_description.key: int(value)})
@@ -1,6 +1,8 @@
 """Support for Exohome sensors."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -11,6 +13,7 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfEnergy,
     UnitOfPower,
@@ -33,8 +36,10 @@ from .core.const import (
     CLIMATE_OPERATING_POWER,
     CLIMATE_ENERGY
 )
+from .core.breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+from .core.metrics import Metrics
 from .coordinator import ExohomeDataUpdateCoordinator
-from .entity import ExohomeEntity, ExohomeEntityDescription
+from .entity import ExohomeEntity, ExohomeEntityDescription, ExohomeHubEntity
 from .const import (
     DOMAIN,
     LOGGER
@@ -46,6 +51,120 @@ class ExohomeSensorDescription(SensorEntityDescription, ExohomeEntityDescription
     """Describe a Exohome sensor."""
 
 
+@dataclass(frozen=True, kw_only=True)
+class ExohomeHubSensorDescription(SensorEntityDescription, ExohomeEntityDescription):
+    """Describe a Exohome account hub sensor."""
+    value_fn: Callable[[ExohomeDataUpdateCoordinator], Any]
+    attributes_fn: Callable[[ExohomeDataUpdateCoordinator], dict] | None = None
+
+
+def _metrics(coordinator: ExohomeDataUpdateCoordinator) -> Metrics:
+    """Return the metrics of the account client."""
+    return coordinator.get_client().metrics
+
+
+def _p95(coordinator: ExohomeDataUpdateCoordinator, name: str) -> float | None:
+    """Return the 95th percentile of a histogram in seconds."""
+    return _metrics(coordinator).histogram(name).quantile(0.95)
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _rtt_attributes(coordinator: ExohomeDataUpdateCoordinator) -> dict:
+    """Return the round trip time quantiles of each verb in milliseconds."""
+    attributes = {}
+    for name, histogram in _metrics(coordinator).histograms.items():
+        if not name.startswith("rtt."):
+            continue
+        attributes[name[4:]] = {
+            "count": histogram.count,
+            "p50": _ms(histogram.quantile(0.5)),
+            "p95": _ms(histogram.quantile(0.95)),
+            "p99": _ms(histogram.quantile(0.99)),
+        }
+    return attributes
+
+
+def _refresh_attributes(coordinator: ExohomeDataUpdateCoordinator) -> dict:
+    """Return the refresh duration quantiles in seconds.
+
+    Only a summary is kept in the state; the buckets are in diagnostics.
+    """
+    attributes = {}
+    for name in ("refresh", "device_refresh"):
+        histogram = _metrics(coordinator).histogram(name)
+        attributes[name] = {
+            "count": histogram.count,
+            "p50": histogram.quantile(0.5),
+            "p95": histogram.quantile(0.95),
+        }
+    return attributes
+
+
+HUB_SENSORS: tuple[ExohomeHubSensorDescription, ...] = (
+    ExohomeHubSensorDescription(
+        key="cloud_connection",
+        name="Cloud Connection",
+        device_class=SensorDeviceClass.ENUM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        options=[STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN],
+        icon="mdi:cloud-check",
+        value_fn=lambda coordinator: coordinator.breaker.state,
+        attributes_fn=lambda coordinator: coordinator.breaker.as_dict(),
+    ),
+    ExohomeHubSensorDescription(
+        key="round_trip_time",
+        name="Round Trip Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+        value_fn=lambda coordinator: _ms(_p95(coordinator, "rtt")),
+        attributes_fn=_rtt_attributes,
+    ),
+    ExohomeHubSensorDescription(
+        key="refresh_duration",
+        name="Refresh Duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-sync-outline",
+        value_fn=lambda coordinator: _p95(coordinator, "refresh"),
+        attributes_fn=_refresh_attributes,
+    ),
+    ExohomeHubSensorDescription(
+        key="frames_received",
+        name="Frames Received",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:swap-vertical",
+        value_fn=lambda coordinator: _metrics(coordinator).counter("frames_in"),
+        attributes_fn=lambda coordinator: {
+            name: _metrics(coordinator).counter(name)
+            for name in ("frames_out", "bytes_in", "bytes_out")
+        },
+    ),
+    ExohomeHubSensorDescription(
+        key="request_timeouts",
+        name="Request Timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-alert-outline",
+        value_fn=lambda coordinator: _metrics(coordinator).counter("timeouts"),
+        attributes_fn=lambda coordinator: {
+            name: _metrics(coordinator).counter(name)
+            for name in ("retries", "reconnects", "connect_failures")
+        },
+    ),
+)
+
+
 AIRPURIFIER_SENSORS: tuple[ExohomeSensorDescription, ...] = (
     ExohomeSensorDescription(
         key=AIRPURIFIER_AIR_QUALITY,
@@ -82,7 +201,9 @@ CLIMATE_SENSORS: tuple[ExohomeSensorDescription, ...] = (
     ExohomeSensorDescription(
         key=CLIMATE_ERROR_CODE,
         name="Error Code",
-        icon="mdi:alert-circle"
+        icon="mdi:alert-circle",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     ExohomeSensorDescription(
         key=CLIMATE_TEMPERATURE_OUTDOOR,
@@ -125,6 +246,10 @@ async def async_setup_entry(
     coordinator: ExohomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
     devices = coordinator.data
 
+    async_add_entities(
+        ExohomeHubSensor(coordinator, description) for description in HUB_SENSORS
+    )
+
     if ((isinstance(devices, dict) and len(devices) <= 1) or (devices is None)):
         return
 
@@ -191,3 +316,21 @@ class ExohomeSensor(ExohomeEntity, SensorEntity):
         if self.entity_description.key in [CLIMATE_ENERGY, CLIMATE_OPERATING_CURRENT]:
             return float(int(status[self.entity_description.key]) * 0.1)
         return status[self.entity_description.key]
+
+
+class ExohomeHubSensor(ExohomeHubEntity, SensorEntity):
+    """Define a Exohome account hub sensor."""
+    entity_description: ExohomeHubSensorDescription
+
+    @property
+    def native_value(self) -> Any:
+        """Return the value reported by the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
+
@@ -0,0 +1,241 @@
+"""Define services for the Sampo Smart Home integration."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .core.client import DEFAULT_CONCURRENCY
+from .core.errors import ExohomeError
+from .core.profiler import PROFILER, write_profile
+from .coordinator import ExohomeDataUpdateCoordinator
+from .const import DOMAIN
+
+SERVICE_BENCHMARK = "benchmark"
+SERVICE_PROFILE = "profile"
+SERVICE_SET_MANY = "set_many"
+
+ATTR_COMMANDS = "commands"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_CYCLES = "cycles"
+ATTR_DATA = "data"
+ATTR_DEVICE = "device"
+ATTR_DURATION = "duration"
+ATTR_FIELD = "field"
+ATTR_NOOP_SET = "noop_set"
+ATTR_SAMPLES = "samples"
+
+DEFAULT_PROFILE_DURATION = 60
+
+SET_MANY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_COMMANDS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_DEVICE): cv.string,
+                        vol.Required(ATTR_DATA): {cv.string: vol.Coerce(int)},
+                    }
+                )
+            ],
+        ),
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_CYCLES): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+BENCHMARK_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SAMPLES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+        vol.Optional(ATTR_CONCURRENCY, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+        vol.Optional(ATTR_NOOP_SET, default=False): cv.boolean,
+        vol.Optional(ATTR_FIELD): vol.All(cv.string, vol.Upper),
+        vol.Optional(ATTR_DEVICE): cv.string,
+    }
+)
+
+
+def _coordinators(hass: HomeAssistant) -> list[ExohomeDataUpdateCoordinator]:
+    """Return the coordinators of all loaded config entries."""
+    return [
+        coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, ExohomeDataUpdateCoordinator)
+    ]
+
+
+def _resolve_device(hass: HomeAssistant, device: str) -> str:
+    """Return the Exohome device id for an Exohome or registry device id."""
+    registry = dr.async_get(hass)
+    if (entry := registry.async_get(device)) is not None:
+        for domain, identifier in entry.identifiers:
+            if domain == DOMAIN:
+                return identifier
+    return device
+
+
+async def _async_set_many(call: ServiceCall) -> ServiceResponse:
+    """Send commands to many devices and refresh each account once."""
+    hass = call.hass
+    coordinators = _coordinators(hass)
+    grouped: dict[ExohomeDataUpdateCoordinator, list[tuple[int, str, dict]]] = {}
+    # One result per command, in the order of the commands.
+    results: list[dict[str, Any]] = []
+
+    for index, command in enumerate(call.data[ATTR_COMMANDS]):
+        device = _resolve_device(hass, command[ATTR_DEVICE])
+        results.append({"device": device, "success": False, "error": None})
+        for coordinator in coordinators:
+            if coordinator.data and device in coordinator.data:
+                grouped.setdefault(coordinator, []).append(
+                    (index, device, command[ATTR_DATA])
+                )
+                break
+        else:
+            results[index]["error"] = "unknown device"
+
+    for coordinator, commands in grouped.items():
+        sent = await coordinator.get_client().set_devices(
+            [(device, data) for _, device, data in commands],
+            concurrency=call.data[ATTR_CONCURRENCY],
+        )
+        for (index, _, _), result in zip(commands, sent, strict=True):
+            results[index] = result
+        await coordinator.async_refresh_devices(
+            [device for _, device, _ in commands]
+        )
+
+    return {"results": results}
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile refreshes, frame decoding and state writes for a while.
+
+    The profile stops after the duration, or once the given number of
+    refreshes finished if that comes first, and is written as a pstats file
+    under the config directory, unless none of that work ran meanwhile.
+    """
+    if PROFILER.active:
+        raise HomeAssistantError("A profile is already running")
+    hass = call.hass
+    started = dt_util.utcnow()
+    PROFILER.start()
+    try:
+        async with asyncio.timeout(call.data[ATTR_DURATION]):
+            if ATTR_CYCLES in call.data:
+                await PROFILER.async_wait_cycles(call.data[ATTR_CYCLES])
+            else:
+                await asyncio.Event().wait()
+    except TimeoutError:
+        pass
+    finally:
+        cycles, skipped = PROFILER.cycles, PROFILER.skipped
+        profile = PROFILER.stop()
+
+    path = hass.config.path(
+        DOMAIN, f"profile-{started.strftime('%Y%m%d-%H%M%S')}.prof"
+    )
+    summary = await hass.async_add_executor_job(write_profile, profile, path)
+    return {
+        "duration": round((dt_util.utcnow() - started).total_seconds(), 3),
+        "cycles": cycles,
+        "skipped_steps": skipped,
+        **summary,
+    }
+
+
+async def _async_benchmark(call: ServiceCall) -> ServiceResponse:
+    """Measure the cloud connection of each account on a separate socket.
+
+    With ``noop_set`` one device per account, or the given device on the
+    account listing it, is sent the value its ``field`` already has.
+    """
+    hass = call.hass
+    if call.data[ATTR_NOOP_SET] and ATTR_FIELD not in call.data:
+        raise HomeAssistantError("A no-op set needs the field to write")
+    device = (
+        _resolve_device(hass, call.data[ATTR_DEVICE])
+        if ATTR_DEVICE in call.data
+        else None
+    )
+    results: dict[str, dict[str, Any]] = {}
+    for coordinator in _coordinators(hass):
+        noop_set = None
+        if call.data[ATTR_NOOP_SET]:
+            listed = coordinator.data or {}
+            if device is not None:
+                noop_set = device if device in listed else None
+            else:
+                noop_set = next(
+                    (
+                        dev
+                        for dev in listed
+                        if coordinator.is_device_available(dev)
+                    ),
+                    None,
+                )
+        try:
+            result = await coordinator.get_client().async_benchmark(
+                samples=call.data[ATTR_SAMPLES],
+                concurrency=call.data[ATTR_CONCURRENCY],
+                noop_set=noop_set,
+                field=call.data.get(ATTR_FIELD),
+            )
+        except ExohomeError as err:
+            result = {"error": str(err)}
+        results[coordinator.config_entry.entry_id] = result
+    return {"results": results}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_MANY,
+        _async_set_many,
+        schema=SET_MANY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BENCHMARK,
+        _async_benchmark,
+        schema=BENCHMARK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
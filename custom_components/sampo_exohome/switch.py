@@ -1,6 +1,5 @@
 """Support for Exohome switch."""
 
-import asyncio
 from dataclasses import dataclass
 
 from homeassistant.components.switch import (
@@ -150,14 +149,8 @@ class ExohomeSwitch(ExohomeEntity, SwitchEntity):
 
     async def async_turn_on(self) -> None:
         """Turn the switch on."""
-        await self.client.set_device(
-            self.device, self.entity_description.key, 1)
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({self.entity_description.key: 1})
 
     async def async_turn_off(self) -> None:
         """Turn the switch off."""
-        await self.client.set_device(
-            self.device, self.entity_description.key, 0)
-        await asyncio.sleep(1)
-        await self.coordinator.async_request_refresh()
+        await self.async_set_device({self.entity_description.key: 0})
@@ -0,0 +1 @@
+"""Tests for the Sampo Smart Home integration."""
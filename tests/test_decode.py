@@ -0,0 +1,156 @@
+"""Tests for the sliced websocket frame decoding."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from custom_components.sampo_exohome.core.decode import (
+    async_decode_frame,
+    decode_frame,
+)
+
+
+def _decode(text: str | bytes, **kwargs: Any) -> Any:
+    """Decode a frame with the sliced decoder and drop the timing."""
+    frame, longest = asyncio.run(async_decode_frame(text, **kwargs))
+    assert longest >= 0
+    return frame
+
+
+def _device(index: int, **properties: Any) -> dict[str, Any]:
+    return {
+        "device": f"dev{index:04d}",
+        "properties": {
+            "displayName": f"Device {index}",
+            "status": {"H00": index % 2, "H03": 20 + index % 10},
+            **properties,
+        },
+    }
+
+
+FRAMES = {
+    "flat": {"id": 1, "response": "get", "status": "ok", "data": [1, 2, 3]},
+    "empty_array": {"id": 2, "response": "get", "status": "ok", "data": []},
+    "nested_objects": {
+        "id": 3,
+        "status": "ok",
+        "data": [_device(i, profile={"esh": {"model": "AC", "device_id": 1}})
+                 for i in range(5)],
+    },
+    "nested_data_key_first": {
+        "id": 4,
+        "meta": {"data": {"not": "the array"}, "list": [{"data": [9]}]},
+        "data": [{"data": [1, {"data": []}]}, [[], [[]]]],
+    },
+    "escaped_strings": {
+        "id": 5,
+        "note": 'a "quoted" \\ "data": [ value',
+        "data": [{"name": 'back\\slash \\" and "quotes"'}, "\\", '"'],
+    },
+    "brackets_in_strings": {
+        "id": 6,
+        "label": "}]{[",
+        "data": [{"displayName": "Living room ]["}, "{", "]", '"data":[1]'],
+        "after": "]}",
+    },
+    "unicode": {
+        "id": 7,
+        "data": [{"displayName": "客廳冷氣 ☃"}, "]"],
+    },
+    "data_not_array": {"id": 8, "status": "ok", "data": {"device": "dev0001"}},
+    "no_data": {"id": 9, "response": "set", "status": "ok"},
+    "data_last_key": {"status": "ok", "id": 10, "data": [True, False, None, 1.5]},
+}
+
+
+@pytest.mark.parametrize("frame", FRAMES.values(), ids=FRAMES.keys())
+def test_matches_json_loads(frame: dict[str, Any]) -> None:
+    """Test the sliced decode gives the same frame as json.loads."""
+    text = json.dumps(frame)
+    assert _decode(text) == json.loads(text)
+
+
+@pytest.mark.parametrize("frame", FRAMES.values(), ids=FRAMES.keys())
+def test_matches_json_loads_compact_and_ascii(frame: dict[str, Any]) -> None:
+    """Test whitespace and escaping of the encoding do not matter."""
+    for text in (
+        json.dumps(frame, separators=(",", ":")),
+        json.dumps(frame, indent=2, ensure_ascii=True),
+    ):
+        assert _decode(text) == json.loads(text)
+
+
+def test_escaped_bracket_in_key_and_value() -> None:
+    """Test escapes written by hand, which json.dumps would not produce."""
+    text = (
+        '{"d\\u0061ta": "x", "x\\"data\\"": ["]"], '
+        '"data": ["\\u005d", "\\"]\\"", {"k": "\\\\"}]}'
+    )
+    assert _decode(text) == json.loads(text)
+
+
+def test_yields_while_decoding() -> None:
+    """Test a long array is decoded the same when every item yields."""
+    frame = {"id": 11, "status": "ok", "data": [_device(i) for i in range(2000)]}
+    text = json.dumps(frame)
+    assert _decode(text, slice_time=0) == json.loads(text)
+
+
+def test_bytes() -> None:
+    """Test frames received as bytes."""
+    frame = FRAMES["unicode"]
+    text = json.dumps(frame, ensure_ascii=False).encode()
+    assert _decode(text) == json.loads(text)
+
+
+def test_device_list_normalized() -> None:
+    """Test a device list is normalized the same way in both decoders."""
+    text = json.dumps(
+        {
+            "response": "lst_device",
+            "status": "ok",
+            "data": [
+                {"device": "dev0001"},
+                {"properties": {"displayName": "no id"}},
+                "not a device",
+                _device(2),
+                {"device": "dev0003", "properties": None},
+            ],
+        }
+    )
+    frame = _decode(text)
+    assert frame == decode_frame(text)
+    assert [dev["device"] for dev in frame["data"]] == [
+        "dev0001",
+        "dev0002",
+        "dev0003",
+    ]
+    assert all(isinstance(dev["properties"], dict) for dev in frame["data"])
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"data": [1, 2',
+        '{"data": [1, 2,',
+        '{"data": [1 2]}',
+        '{"data": [1,, 2]}',
+        '{"data": [, 1]}',
+        '{"data": [1, ]}',
+        '{"data": [1,]}',
+        '{"data": [1] 2]}',
+        '{"data": [1, 2]',
+        '{"data": [}',
+        "not json",
+    ],
+)
+def test_invalid(text: str) -> None:
+    """Test invalid frames raise ValueError like json.loads."""
+    with pytest.raises(ValueError):
+        json.loads(text)
+    with pytest.raises(ValueError):
+        _decode(text)
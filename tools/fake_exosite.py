@@ -0,0 +1,429 @@
+"""A local stand-in for the Sampo Exosite cloud.
+
+It serves the REST endpoints (``/session``, ``/fw/list``) and the ``/phone``
+websocket verbs the integration uses, for a fleet of synthetic climates,
+fans and air purifiers. Latency, jitter, loss, throttling and pushed status
+can be tuned to load-test the client.
+
+Run it and point the client at it:
+
+    python tools/fake_exosite.py --climates 20 --latency 0.05
+    export EXOHOME_API_BASE=http://127.0.0.1:8765/api:1
+    export EXOHOME_WSS_BASE=ws://127.0.0.1:8765/api:1
+
+Any email and password are accepted. Traffic counters are served at
+``GET /_fake/stats`` and zeroed with ``POST /_fake/reset``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+import random
+import time
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+DEVICE_TYPE_CLIMATE = 1
+DEVICE_TYPE_AIRPURIFIER = 8
+DEVICE_TYPE_FAN = 15
+
+TOKEN = "fake-token"
+USER_ID = "fake-user"
+
+CLIMATE_STATUS = {
+    "H00": 1, "H01": 0, "H02": 0, "H03": 26, "H04": 28, "H05": 0, "H07": 0,
+    "H0E": 0, "H0F": 0, "H10": 0, "H11": 0, "H15": 0, "H17": 0, "H18": 0,
+    "H19": 0, "H1A": 0, "H1B": 0, "H1E": 1, "H21": 31, "H24": 35, "H27": 820,
+    "H28": 1234, "H7F": 0,
+}
+CLIMATE_RANGE = {"H01": 0b11111, "H02": 0b111, "H0F": 0b1111, "H11": 0b1111}
+FAN_STATUS = {"H00": 1, "H01": 0, "H02": 5, "H03": 27, "H05": 0}
+FAN_RANGE = {"H01": 0b11111, "H02": 0x7FFF}
+AIRPURIFIER_STATUS = {
+    "H00": 1, "H01": 2, "H04": 1, "H05": 0, "H07": 0, "H08": 1, "H60": 0,
+    "H61": 12, "H62": 0, "H63": 3456, "H64": 0, "H7F": 0,
+}
+AIRPURIFIER_RANGE = {"H01": 0b11111, "H62": 0b111}
+
+# Fields that drift on their own and are pushed when push is enabled.
+TELEMETRY = {
+    DEVICE_TYPE_CLIMATE: ("H04", "H21", "H24", "H27"),
+    DEVICE_TYPE_FAN: ("H03",),
+    DEVICE_TYPE_AIRPURIFIER: ("H61", "H04"),
+}
+
+
+@dataclass
+class FakeConfig:
+    """Define the fleet and network behaviour of the fake cloud."""
+
+    climates: int = 5
+    fans: int = 2
+    purifiers: int = 2
+    latency: float = 0.0
+    jitter: float = 0.0
+    loss: float = 0.0
+    throttle: float = 0.0
+    push_interval: float = 0.0
+    push_on_set: bool = True
+    apply_delay: float = 0.2
+    seed: int = 0
+
+
+@dataclass
+class FakeStats:
+    """Define traffic counters of the fake cloud."""
+
+    frames_in: int = 0
+    frames_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    pushes: int = 0
+    dropped: int = 0
+    throttled: int = 0
+    requests: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters."""
+        return {
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "pushes": self.pushes,
+            "dropped": self.dropped,
+            "throttled": self.throttled,
+            "requests": dict(self.requests),
+        }
+
+
+def make_device(index: int, device_type: int) -> dict[str, Any]:
+    """Return a synthetic roster entry with its status."""
+    status, ranges, model = {
+        DEVICE_TYPE_CLIMATE: (CLIMATE_STATUS, CLIMATE_RANGE, "AU-MF22DC"),
+        DEVICE_TYPE_FAN: (FAN_STATUS, FAN_RANGE, "SK-FA14DC"),
+        DEVICE_TYPE_AIRPURIFIER: (AIRPURIFIER_STATUS, AIRPURIFIER_RANGE, "AH-PB14B"),
+    }[device_type]
+    device = f"fake{device_type:02d}{index:05d}"
+    return {
+        "device": device,
+        "properties": {
+            "displayName": f"Fake {model} {index}",
+            "connected": True,
+            "device_status": "online",
+            "fields": list(status),
+            "fields_range": [{key: value} for key, value in ranges.items()],
+            "profile": {
+                "esh": {
+                    "device_id": str(device_type),
+                    "model": model,
+                    "brand": "SAMPO",
+                    "esh_version": "2.0",
+                },
+                "module": {
+                    "firmware_version": "1.0.0",
+                    "local_ip": f"10.0.{index // 250}.{index % 250 + 1}",
+                },
+            },
+        },
+        "status": dict(status),
+    }
+
+
+class FakeExosite:
+    """Define the fake cloud."""
+
+    def __init__(self, config: FakeConfig | None = None) -> None:
+        """Initialize."""
+        self.config = config or FakeConfig()
+        self.stats = FakeStats()
+        self._random = random.Random(self.config.seed)
+        self.devices: dict[str, dict[str, Any]] = {}
+        for device_type, count in (
+            (DEVICE_TYPE_CLIMATE, self.config.climates),
+            (DEVICE_TYPE_FAN, self.config.fans),
+            (DEVICE_TYPE_AIRPURIFIER, self.config.purifiers),
+        ):
+            for index in range(count):
+                dev = make_device(index, device_type)
+                self.devices[dev["device"]] = dev
+        self._runner: web.AppRunner | None = None
+        self.api_base = ""
+        self.wss_base = ""
+
+    def reset_stats(self) -> None:
+        """Zero the traffic counters."""
+        self.stats = FakeStats()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving; port 0 picks a free port."""
+        app = web.Application()
+        app.router.add_post("/api:1/session", self._handle_session)
+        app.router.add_get("/api:1/fw/list/{models}", self._handle_fw_list)
+        app.router.add_get("/api:1/phone", self._handle_phone)
+        app.router.add_get("/_fake/stats", self._handle_stats)
+        app.router.add_post("/_fake/reset", self._handle_reset)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.api_base = f"http://{host}:{port}/api:1"
+        self.wss_base = f"ws://{host}:{port}/api:1"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self) -> None:
+        """Wait for one simulated network round trip."""
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += self._random.uniform(-self.config.jitter, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _handle_session(self, request: web.Request) -> web.Response:
+        """Accept any credentials."""
+        await self._delay()
+        body = await request.json()
+        if not body.get("email") or not body.get("password"):
+            return web.json_response(
+                {"errors": [{"title": "Invalid credentials"}]}, status=401
+            )
+        return web.json_response({"id": USER_ID, "token": TOKEN})
+
+    async def _handle_fw_list(self, request: web.Request) -> web.Response:
+        """Report that no firmware updates are available."""
+        await self._delay()
+        return web.json_response([])
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        """Return the traffic counters."""
+        return web.json_response(self.stats.as_dict())
+
+    async def _handle_reset(self, request: web.Request) -> web.Response:
+        """Zero the traffic counters."""
+        self.reset_stats()
+        return web.json_response({})
+
+    async def _handle_phone(self, request: web.Request) -> web.WebSocketResponse:
+        """Serve one websocket connection."""
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        connection = _Connection(self, ws)
+        await connection.run()
+        return ws
+
+
+class _Connection:
+    """Define one websocket session of the fake cloud."""
+
+    def __init__(self, cloud: FakeExosite, ws: web.WebSocketResponse) -> None:
+        self.cloud = cloud
+        self.ws = ws
+        self.logged_in = False
+        self.tasks: set[asyncio.Task] = set()
+        self.allowance = cloud.config.throttle
+        self.checked = time.monotonic()
+
+    async def run(self) -> None:
+        """Handle frames until the client disconnects."""
+        if self.cloud.config.push_interval > 0:
+            self._spawn(self._push_loop())
+        try:
+            async for msg in self.ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                stats = self.cloud.stats
+                stats.frames_in += 1
+                stats.bytes_in += len(msg.data)
+                try:
+                    frame = json.loads(msg.data)
+                except ValueError:
+                    continue
+                self._spawn(self._respond(frame))
+        finally:
+            for task in self.tasks:
+                task.cancel()
+
+    def _spawn(self, coro) -> None:
+        """Run a coroutine for the lifetime of the connection."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def send(self, frame: dict[str, Any]) -> None:
+        """Send a frame and count it."""
+        if self.ws.closed:
+            return
+        text = json.dumps(frame)
+        stats = self.cloud.stats
+        stats.frames_out += 1
+        stats.bytes_out += len(text)
+        await self.ws.send_str(text)
+
+    def _throttled(self) -> bool:
+        """Return whether a request exceeds the configured rate."""
+        rate = self.cloud.config.throttle
+        if rate <= 0:
+            return False
+        now = time.monotonic()
+        self.allowance = min(rate, self.allowance + (now - self.checked) * rate)
+        self.checked = now
+        if self.allowance < 1:
+            return True
+        self.allowance -= 1
+        return False
+
+    async def _respond(self, frame: dict[str, Any]) -> None:
+        """Answer one request."""
+        cloud = self.cloud
+        request = frame.get("request", "")
+        cloud.stats.requests[request] = cloud.stats.requests.get(request, 0) + 1
+        reply = {"id": frame.get("id"), "response": request}
+
+        if self._throttled():
+            cloud.stats.throttled += 1
+            await self.send({**reply, "status": "too_many_requests"})
+            return
+        await cloud._delay()
+        if cloud.config.loss and cloud._random.random() < cloud.config.loss:
+            cloud.stats.dropped += 1
+            return
+
+        handler = getattr(self, f"_verb_{request}", None)
+        if handler is None:
+            await self.send({**reply, "status": "unknown_request"})
+            return
+        if request != "login" and not self.logged_in:
+            await self.send({**reply, "status": "unauthorized"})
+            return
+        status, data = await handler(frame)
+        await self.send({**reply, "status": status, "data": data})
+
+    async def _verb_login(self, frame: dict) -> tuple[str, Any]:
+        if (frame.get("data") or {}).get("token") != TOKEN:
+            return "unauthorized", None
+        self.logged_in = True
+        return "ok", None
+
+    async def _verb_provision_token(self, frame: dict) -> tuple[str, Any]:
+        expires_in = (frame.get("data") or {}).get("expires_in", 2592000)
+        return "ok", {"token": "fake-provision-token", "expires_in": expires_in}
+
+    async def _verb_get_user_data(self, frame: dict) -> tuple[str, Any]:
+        return "ok", {}
+
+    async def _verb_get_me(self, frame: dict) -> tuple[str, Any]:
+        return "ok", {"id": USER_ID, "email": "fake@example.com"}
+
+    async def _verb_lst_device(self, frame: dict) -> tuple[str, Any]:
+        return "ok", [
+            {"device": dev["device"], "properties": dev["properties"]}
+            for dev in self.cloud.devices.values()
+        ]
+
+    async def _verb_get(self, frame: dict) -> tuple[str, Any]:
+        dev = self.cloud.devices.get(frame.get("device"))
+        if dev is None:
+            return "not_found", None
+        status = dev["status"]
+        fields = (frame.get("data") or {}).get("fields")
+        if fields is not None:
+            status = {key: status[key] for key in fields if key in status}
+        return "ok", {"device": dev["device"], "status": dict(status)}
+
+    async def _verb_set(self, frame: dict) -> tuple[str, Any]:
+        dev = self.cloud.devices.get(frame.get("device"))
+        if dev is None:
+            return "not_found", None
+        values = frame.get("data") or {}
+        self._spawn(self._apply(dev, values))
+        return "ok", None
+
+    async def _apply(self, dev: dict, values: dict) -> None:
+        """Apply written values after the device reacts, then push them."""
+        if self.cloud.config.apply_delay > 0:
+            await asyncio.sleep(self.cloud.config.apply_delay)
+        dev["status"].update(values)
+        if self.cloud.config.push_on_set:
+            await self._push(dev, values)
+
+    async def _push(self, dev: dict, status: dict) -> None:
+        self.cloud.stats.pushes += 1
+        await self.send(
+            {"response": "status", "data": {"device": dev["device"], "status": status}}
+        )
+
+    async def _push_loop(self) -> None:
+        """Push drifting telemetry of random devices."""
+        cloud = self.cloud
+        devices = list(cloud.devices.values())
+        while devices:
+            await asyncio.sleep(cloud.config.push_interval)
+            if not self.logged_in:
+                continue
+            dev = cloud._random.choice(devices)
+            device_type = int(dev["properties"]["profile"]["esh"]["device_id"])
+            key = cloud._random.choice(TELEMETRY[device_type])
+            dev["status"][key] += cloud._random.choice((-1, 1))
+            await self._push(dev, {key: dev["status"][key]})
+
+
+async def _main(args: argparse.Namespace) -> None:
+    cloud = FakeExosite(
+        FakeConfig(
+            climates=args.climates,
+            fans=args.fans,
+            purifiers=args.purifiers,
+            latency=args.latency,
+            jitter=args.jitter,
+            loss=args.loss,
+            throttle=args.throttle,
+            push_interval=args.push_interval,
+            apply_delay=args.apply_delay,
+            seed=args.seed,
+        )
+    )
+    await cloud.start(args.host, args.port)
+    print(f"export EXOHOME_API_BASE={cloud.api_base}")
+    print(f"export EXOHOME_WSS_BASE={cloud.wss_base}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--climates", type=int, default=5)
+    parser.add_argument("--fans", type=int, default=2)
+    parser.add_argument("--purifiers", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="0..1")
+    parser.add_argument(
+        "--throttle", type=float, default=0.0, help="requests/s per connection"
+    )
+    parser.add_argument(
+        "--push-interval", type=float, default=0.0, help="seconds, 0 disables"
+    )
+    parser.add_argument("--apply-delay", type=float, default=0.2, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()